@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from portal.api.views.chore import ChoreAssignmentDetailedViewSet
+from portal.api.views.task import TaskDetailedViewSet, TaskFileViewSet
+
+VIEWSETS = {
+    'tasks': TaskDetailedViewSet,
+    'assignments': ChoreAssignmentDetailedViewSet,
+    'task-files': TaskFileViewSet,
+}
+
+
+class Command(BaseCommand):
+    help = 'Compare DRF and compiled serializers of a workspace list endpoint: output parity and timings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('workspace_id')
+        parser.add_argument('--endpoint', choices=VIEWSETS.keys(), action='append')
+        parser.add_argument('--repeat', type=int, default=10)
+
+    def handle(self, *args, **options):
+        renderer = JSONRenderer()
+        for name in options['endpoint'] or VIEWSETS.keys():
+            viewset = VIEWSETS[name](kwargs={'ws_pk': options['workspace_id']}, action='list')
+            viewset.request = Request(RequestFactory().get('/'))
+            # Rows are loaded once, only serialization is timed
+            rows = list(viewset.get_queryset())
+            serializers = {
+                'drf': viewset.serializer_class,
+                'compiled': viewset.compiled_serializer_class,
+            }
+
+            outputs = {}
+            timings = {}
+            for label, serializer_class in serializers.items():
+                started = time.perf_counter()
+                for _ in range(options['repeat']):
+                    data = serializer_class(rows, many=True, context={}).data
+                timings[label] = (time.perf_counter() - started) / options['repeat']
+                outputs[label] = renderer.render(data)
+
+            if outputs['drf'] != outputs['compiled']:
+                raise CommandError(f"{name}: compiled output differs from {viewset.serializer_class.__name__}")
+
+            self.stdout.write(
+                f"{name}: {len(rows)} rows, "
+                f"drf {timings['drf'] * 1000:.1f}ms, compiled {timings['compiled'] * 1000:.1f}ms "
+                f"({timings['drf'] / max(timings['compiled'], 1e-9):.1f}x)"
+            )
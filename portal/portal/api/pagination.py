@@ -0,0 +1,27 @@
+from rest_framework.pagination import CursorPagination
+
+
+class OptInCursorPagination(CursorPagination):
+    """
+    Cursor (keyset) pagination that is only applied when the client asks for
+    it with ``?page_size=`` (or follows a ``next``/``previous`` link, which
+    carries it). Without it the endpoint keeps returning the plain list, so
+    existing clients are unaffected.
+
+    As DRF's CursorPagination does, pages are selected on the leading
+    ordering field only: the cursor carries its position, rows are read
+    with ``WHERE <field> <= <position>`` and an offset skips those already
+    sent with that same value. Rows sharing a value are therefore paged by
+    offset, not by ``id``; ``id`` only makes their order deterministic.
+    """
+    page_size = None
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+
+class UpdatedAtCursorPagination(OptInCursorPagination):
+    ordering = ('-updated_at', '-id')
+
+
+class CreatedAtCursorPagination(OptInCursorPagination):
+    ordering = ('-created_at', '-id')
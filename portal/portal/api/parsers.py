@@ -0,0 +1,33 @@
+import codecs
+import re
+
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.utils import json
+
+# orjson only handles 64-bit integers; anything this long may not fit and is
+# left to the stdlib parser (false positives, e.g. inside strings, only cost speed)
+_LONG_NUMBER = re.compile(rb'\d{19}')
+
+
+class ORJSONParser(JSONParser):
+    """
+    Drop-in JSONParser using orjson; NaN/Infinity are rejected as before.
+    Documents with integers beyond 64 bits are parsed by JSONParser's json.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+
+        try:
+            data = stream.read()
+            if codecs.lookup(encoding).name != 'utf-8':
+                data = data.decode(encoding).encode('utf-8')
+            if _LONG_NUMBER.search(data):
+                return json.loads(data)
+            return orjson.loads(data)
+        except (ValueError, UnicodeDecodeError) as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -9,6 +9,7 @@ from portal.workspace.models import (
     Workspace, WorkspaceMember, WorkspaceInvite,
 )
 from portal.storage.models import WorkspaceFile
+from portal.api.taxonomy import workspace_taxonomy
 
 class OrganizationSerializer(serializers.ModelSerializer):
     class Meta:
@@ -80,6 +81,14 @@ class StageSerializer(serializers.ModelSerializer):
         fields = ['id', 'label', 'key', 'workspace']
         read_only_fields = ['id', 'key', 'workspace']
 
+class CategoryUpsertSerializer(CategorySerializer):
+    """CategorySerializer for upserts, the workspace comes from the URL."""
+    workspace = serializers.PrimaryKeyRelatedField(read_only=True)
+
+class StageUpsertSerializer(StageSerializer):
+    """StageSerializer for upserts, the workspace comes from the URL."""
+    workspace = serializers.PrimaryKeyRelatedField(read_only=True)
+
 class TaskSerializer(serializers.ModelSerializer):
     workspace = serializers.PrimaryKeyRelatedField(queryset=Workspace.objects.all())
     category = serializers.CharField(source='category_key', allow_null=True, required=False)
@@ -91,6 +100,10 @@ class TaskSerializer(serializers.ModelSerializer):
         fields = ['id', 'title', 'description', 'created_at', 'updated_at', 'workspace', 'category', 'category_key', 'stage', 'stage_key', 'owner']
         read_only_fields = ['id', 'created_at', 'updated_at', 'workspace']
 
+class TaskBulkSerializer(TaskSerializer):
+    """TaskSerializer for bulk writes, the workspace comes from the URL."""
+    workspace = serializers.PrimaryKeyRelatedField(read_only=True)
+
 class TaskCommentSerializer(serializers.ModelSerializer):
     task = serializers.PrimaryKeyRelatedField(read_only=True)
     author = serializers.StringRelatedField(read_only=True)
@@ -136,6 +149,49 @@ class ChoreAssignmentSubmissionSerializer(serializers.ModelSerializer):
         fields = ['id', 'chore_assigned', 'user', 'status', 'notes', 'submitted_at', 'updated_at']
         read_only_fields = ['id', 'chore_assigned', 'user', 'submitted_at', 'updated_at']
 
+class ChoreAssignedBulkSerializer(ChoreAssignedSerializer):
+    """
+    ChoreAssignedSerializer for bulk writes: chore and user are given on
+    create, the chore must belong to the context's `workspace_id`.
+    """
+    chore = serializers.PrimaryKeyRelatedField(queryset=Chore.objects.all())
+    user = serializers.PrimaryKeyRelatedField(queryset=User.objects.all())
+
+    class Meta(ChoreAssignedSerializer.Meta):
+        # unique_together includes assigned_at, set on insert: skip the
+        # per-item lookup of the generated validator
+        validators = []
+
+    def validate_chore(self, chore):
+        if self.instance is not None and chore.id != self.instance.chore_id:
+            raise serializers.ValidationError('Cannot be changed.')
+        if str(chore.workspace_id) != str(self.context['workspace_id']):
+            raise serializers.ValidationError('Not found.')
+        return chore
+
+class ChoreAssignmentSubmissionBulkSerializer(ChoreAssignmentSubmissionSerializer):
+    """
+    ChoreAssignmentSubmissionSerializer for bulk submits, the assignment must
+    belong to the context's `workspace_id`.
+    """
+    chore_assigned = serializers.PrimaryKeyRelatedField(queryset=ChoreAssigned.objects.all())
+
+    def validate_chore_assigned(self, chore_assigned):
+        if str(chore_assigned.workspace_id) != str(self.context['workspace_id']):
+            raise serializers.ValidationError('Not found.')
+        return chore_assigned
+
+class SparseFieldsMixin:
+    """
+    Accepts a `fields` argument restricting the serialized fields, see
+    SparseFieldsetMixin. None keeps them all.
+    """
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
 # --- Re-usable Nested Serializers ---
 
 class NestedUserSerializer(serializers.ModelSerializer):
@@ -167,6 +223,21 @@ class NestedStageSerializer(serializers.ModelSerializer):
         model = Stage
         fields = ['id', 'label', 'key'] # Essential stage info
 
+def get_workspace_taxonomy(context, workspace_id):
+    """
+    Categories and stages of a workspace for nested serialization, see
+    workspace_taxonomy. Memoized on the request when there is one, otherwise
+    on the serializer context.
+    """
+    request = context.get('request')
+    if request is not None:
+        return workspace_taxonomy(workspace_id, request)
+    taxonomies = context.setdefault('taxonomy', {})
+    taxonomy = taxonomies.get(workspace_id)
+    if taxonomy is None:
+        taxonomy = taxonomies[workspace_id] = workspace_taxonomy(workspace_id)
+    return taxonomy
+
 class NestedTaskFilesSerializer(serializers.ModelSerializer):
     """
     Concise serializer for TaskComment, nested within DetailedTaskSerializer.
@@ -199,18 +270,28 @@ class TaskCommentDetailedSerializer(serializers.ModelSerializer):
         fields = ['id', 'author', 'content', 'files', 'created_at', 'updated_at']
         read_only_fields = ['id', 'author', 'files', 'created_at', 'updated_at']
 
+class TaskCommentChangeSerializer(TaskCommentDetailedSerializer):
+    """TaskCommentDetailedSerializer plus its task, for the changes endpoint."""
+    class Meta(TaskCommentDetailedSerializer.Meta):
+        fields = ['id', 'task', 'author', 'content', 'files', 'created_at', 'updated_at']
+        read_only_fields = fields
+
 class NestedChoreSerializer(serializers.ModelSerializer):
     """
     Concise serializer for Chore details, to be nested within ChoreAssigned.
     Includes the nested category.
     """
-    category = NestedCategorySerializer(read_only=True) # Nested category details
+    category = serializers.SerializerMethodField() # Nested category details
 
     class Meta:
         model = Chore
         fields = ['id', 'title', 'description', 'recurrence', 'category', 'category_key']
         read_only_fields = ['id', 'category', 'category_key']
 
+    def get_category(self, obj):
+        taxonomy = get_workspace_taxonomy(self.context, obj.workspace_id)
+        return taxonomy['categories'].get(obj.category_key)
+
 class NestedChoreResponsibleSerializer(serializers.ModelSerializer):
     user = NestedUserSerializer()
 
@@ -231,7 +312,7 @@ class NestedChoreAssignmentSubmissionSerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'status', 'notes', 'submitted_at', 'updated_at']
         read_only_fields = ['id', 'user', 'submitted_at', 'updated_at']
 
-class TaskDetailedSerializer(serializers.ModelSerializer):
+class TaskDetailedSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Custom serializer to represent a Task with all its related details:
     - Basic task information
@@ -241,8 +322,8 @@ class TaskDetailedSerializer(serializers.ModelSerializer):
     - List of task comments
     """
     workspace = serializers.StringRelatedField() # Display workspace name
-    category = NestedCategorySerializer(read_only=True) # Nested category details
-    stage = NestedStageSerializer(read_only=True) # Nested stage details
+    category = serializers.SerializerMethodField() # Nested category details
+    stage = serializers.SerializerMethodField() # Nested stage details
     owner = NestedUserSerializer(read_only=True) # Nested user details
     comment_files = NestedTaskFilesSerializer(many=True, read_only=True)
 
@@ -259,9 +340,17 @@ class TaskDetailedSerializer(serializers.ModelSerializer):
             'comment_files',
         ]
 
-class ChoreDetailedSerializer(serializers.ModelSerializer):
+    def get_category(self, obj):
+        taxonomy = get_workspace_taxonomy(self.context, obj.workspace_id)
+        return taxonomy['categories'].get(obj.category_key)
+
+    def get_stage(self, obj):
+        taxonomy = get_workspace_taxonomy(self.context, obj.workspace_id)
+        return taxonomy['stages'].get(obj.stage_key)
+
+class ChoreDetailedSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     workspace = serializers.StringRelatedField() # Display workspace name
-    category = NestedCategorySerializer(read_only=True) # Nested category details
+    category = serializers.SerializerMethodField() # Nested category details
     responsibles = NestedChoreResponsibleSerializer(many=True, read_only=True)
 
     class Meta:
@@ -277,7 +366,11 @@ class ChoreDetailedSerializer(serializers.ModelSerializer):
             'recurrence', 'schedule',
         ]
 
-class ChoreAssignmentDetailedSerializer(serializers.ModelSerializer):
+    def get_category(self, obj):
+        taxonomy = get_workspace_taxonomy(self.context, obj.workspace_id)
+        return taxonomy['categories'].get(obj.category_key)
+
+class ChoreAssignmentDetailedSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Custom serializer for ChoreAssigned entries, providing a comprehensive
     view for the user, including full chore details and all submissions.
@@ -0,0 +1,202 @@
+"""
+Read-only serializers that build the response dicts directly, skipping DRF's
+per-field machinery (field binding, get_attribute, to_representation).
+
+Each one mirrors a DRF serializer and must produce the same JSON, key order
+included; `python manage.py benchmark_serializers` checks the parity and
+times both. Querysets are expected to be loaded the same way as for the DRF
+serializer (select_related/prefetch_related), as the same attributes are
+walked.
+"""
+from operator import attrgetter
+
+from django.utils import timezone
+
+from portal.api.serializers import get_workspace_taxonomy
+
+
+def _str(value):
+    return None if value is None else str(value)
+
+
+def _user(user):
+    return None if user is None else {'id': user.id, 'name': str(user)}
+
+
+class CompiledSerializer:
+    """
+    Minimal stand-in for a read-only DRF serializer: accepts the same
+    constructor arguments (including SparseFieldsMixin's `fields`) and
+    exposes `.data`.
+
+    Output keys follow `field_names`; each one is produced by the
+    ``get_<name>`` method when there is one, the plain attribute otherwise.
+    Getters are resolved once per serializer, and unselected fields are never
+    read, so deferred columns stay unloaded.
+    """
+    field_names = ()
+
+    def __init__(self, instance=None, many=False, context=None, fields=None, **kwargs):
+        self.instance = instance
+        self.many = many
+        self.context = context if context is not None else {}
+        self.timezone = None
+        self.getters = [
+            (name, getattr(self, f'get_{name}', None) or attrgetter(name))
+            for name in self.field_names
+            if fields is None or name in fields
+        ]
+
+    @property
+    def data(self):
+        # Resolved once instead of per field, as DateTimeField does
+        self.timezone = timezone.get_current_timezone()
+        if self.many:
+            return [self.to_representation(obj) for obj in self.instance]
+        return self.to_representation(self.instance)
+
+    def to_representation(self, obj):
+        return {name: getter(obj) for name, getter in self.getters}
+
+    def datetime(self, value):
+        """Same ISO 8601 output as DRF's DateTimeField."""
+        if value is None:
+            return None
+        if value.tzinfo is not self.timezone:
+            value = value.astimezone(self.timezone)
+        value = value.isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+
+
+class CompiledTaskDetailedSerializer(CompiledSerializer):
+    """Mirrors TaskDetailedSerializer."""
+    field_names = (
+        'id', 'title', 'description', 'created_at', 'updated_at',
+        'workspace', 'category', 'category_key', 'stage', 'stage_key', 'owner',
+        'comment_files',
+    )
+
+    def get_id(self, task):
+        return str(task.id)
+
+    def get_created_at(self, task):
+        return self.datetime(task.created_at)
+
+    def get_updated_at(self, task):
+        return self.datetime(task.updated_at)
+
+    def get_workspace(self, task):
+        return str(task.workspace)
+
+    def get_category(self, task):
+        return get_workspace_taxonomy(self.context, task.workspace_id)['categories'].get(task.category_key)
+
+    def get_stage(self, task):
+        return get_workspace_taxonomy(self.context, task.workspace_id)['stages'].get(task.stage_key)
+
+    def get_owner(self, task):
+        return _user(task.owner)
+
+    def get_comment_files(self, task):
+        return [
+            {
+                'id': str(comment_file.id),
+                'owner': str(comment_file.owner),
+                'file': comment_file.file_id,
+                'content_type': comment_file.file.content_type,
+                'file_name': comment_file.file.file_name,
+                'created_at': self.datetime(comment_file.created_at),
+            }
+            for comment_file in task.comment_files.all()
+        ]
+
+
+class CompiledChoreAssignmentDetailedSerializer(CompiledSerializer):
+    """Mirrors ChoreAssignmentDetailedSerializer."""
+    field_names = (
+        'id', 'workspace', 'chore', 'user', 'status', 'closed',
+        'assigned_at', 'updated_at', 'submissions',
+    )
+
+    def get_id(self, assignment):
+        return str(assignment.id)
+
+    def get_workspace(self, assignment):
+        return _str(assignment.workspace)
+
+    def get_chore(self, assignment):
+        chore = assignment.chore
+        taxonomy = get_workspace_taxonomy(self.context, chore.workspace_id)
+        return {
+            'id': str(chore.id),
+            'title': chore.title,
+            'description': chore.description,
+            'recurrence': chore.recurrence,
+            'category': taxonomy['categories'].get(chore.category_key),
+            'category_key': chore.category_key,
+        }
+
+    def get_user(self, assignment):
+        return str(assignment.user)
+
+    def get_assigned_at(self, assignment):
+        return self.datetime(assignment.assigned_at)
+
+    def get_updated_at(self, assignment):
+        return self.datetime(assignment.updated_at)
+
+    def get_submissions(self, assignment):
+        return [
+            {
+                'id': str(submission.id),
+                'user': submission.user_id,
+                'status': submission.status,
+                'notes': submission.notes,
+                'submitted_at': self.datetime(submission.submitted_at),
+                'updated_at': self.datetime(submission.updated_at),
+            }
+            for submission in assignment.submissions.all()
+        ]
+
+
+class CompiledTaskFileSerializer(CompiledSerializer):
+    """Mirrors TaskFileSerializer."""
+    field_names = (
+        'id', 'owner', 'file', 'content_type', 'file_name', 'created_at',
+        'task', 'task_title', 'task_category_key', 'comment_content', 'workspace',
+    )
+
+    def get_id(self, task_file):
+        return str(task_file.id)
+
+    def get_owner(self, task_file):
+        return str(task_file.owner)
+
+    def get_file(self, task_file):
+        return task_file.file_id
+
+    def get_content_type(self, task_file):
+        return task_file.file.content_type
+
+    def get_file_name(self, task_file):
+        return task_file.file.file_name
+
+    def get_created_at(self, task_file):
+        return self.datetime(task_file.created_at)
+
+    def get_task(self, task_file):
+        return task_file.task_id
+
+    def get_task_title(self, task_file):
+        return task_file.task.title
+
+    def get_task_category_key(self, task_file):
+        return task_file.task.category_key
+
+    def get_comment_content(self, task_file):
+        return task_file.comment.content
+
+    def get_workspace(self, task_file):
+        return str(task_file.task.workspace)
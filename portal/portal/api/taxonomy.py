@@ -0,0 +1,71 @@
+import json
+
+from django.conf import settings
+
+from portal.cache.redis_client import redis
+from portal.cache.versioning import versioner
+from portal.workspace.models import Category, Stage
+
+CATEGORIES_KEY = '/api/workspaces/{workspace_id}/categories/*/'
+STAGES_KEY = '/api/workspaces/{workspace_id}/stages/*/'
+
+
+def workspace_taxonomy(workspace_id, request=None):
+    """
+    Serialized categories and stages of a workspace, keyed by `key`:
+    ``{'categories': {key: data}, 'stages': {key: data}}``.
+
+    Tasks and chores reference them by key rather than by FK, so every nested
+    serialization needs this map. It is memoized on `request` and shared
+    across workers in Redis under the current versions of the categories and
+    stages resources: saves and deletes bump them through
+    PORTAL_CACHE_SIGNALS, and upserts (which skip save()) explicitly, so
+    stale maps are simply never read again and expire through
+    ``PORTAL_CACHE['TAXONOMY_TTL']``.
+    """
+    memo = getattr(request, '_workspace_taxonomy', None) if request is not None else None
+    if memo is None:
+        memo = {}
+        if request is not None:
+            request._workspace_taxonomy = memo
+
+    workspace_id = str(workspace_id)
+    taxonomy = memo.get(workspace_id)
+    if taxonomy is None:
+        taxonomy = memo[workspace_id] = _get_cached(workspace_id)
+    return taxonomy
+
+
+def _get_cached(workspace_id):
+    versions = versioner.get_many([
+        CATEGORIES_KEY.format(workspace_id=workspace_id),
+        STAGES_KEY.format(workspace_id=workspace_id),
+    ])
+
+    # Without versions a cached map could not be invalidated, skip Redis
+    if None in versions:
+        return _load(workspace_id)
+
+    cache_key = f"workspace-taxonomy:{workspace_id}:{versions[0]}:{versions[1]}"
+    cached = redis.client.get(cache_key)
+    if cached is not None:
+        return json.loads(cached)
+
+    taxonomy = _load(workspace_id)
+    redis.client.set(cache_key, json.dumps(taxonomy), ex=settings.PORTAL_CACHE.get('TAXONOMY_TTL', 3600))
+    return taxonomy
+
+
+def _load(workspace_id):
+    from portal.api.serializers import NestedCategorySerializer, NestedStageSerializer
+
+    return {
+        'categories': {
+            category.key: NestedCategorySerializer(category).data
+            for category in Category.objects.filter(workspace_id=workspace_id)
+        },
+        'stages': {
+            stage.key: NestedStageSerializer(stage).data
+            for stage in Stage.objects.filter(workspace_id=workspace_id)
+        },
+    }
@@ -1,3 +1,343 @@
-from django.test import TestCase
+import datetime
+import io
+import uuid
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.db import connection
+from django.db.models import QuerySet
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from portal.api.parsers import ORJSONParser
+from portal.api.taxonomy import CATEGORIES_KEY, workspace_taxonomy
+from portal.api.renderers import ORJSONRenderer
+
+from portal.auth.models import User
+from portal.cache.tests import FakeRedisMixin
+from portal.cache.versioning import versioner
+from portal.storage.models import WorkspaceFile
+from portal.workspace.models import (
+    Category, Chore, ChoreAssigned, ChoreAssignmentSubmission, ChoreResponsible, Organization, Stage, Task,
+    TaskComment, TaskCommentFile, Workspace, WorkspaceMember,
+)
+
+
+class WorkspaceTestMixin(FakeRedisMixin):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create(username='owner', first_name='Owner')
+        organization = Organization.objects.create(name='Organization')
+        self.workspace = Workspace.objects.create(label='Workspace', organization=organization)
+        WorkspaceMember.objects.create(workspace=self.workspace, user=self.user, role='owner')
+        self.client.force_login(self.user)
+
+
+class TaskDetailedQueryCountTests(WorkspaceTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        Category.objects.create(workspace=self.workspace, label='Category', key='category')
+        Stage.objects.create(workspace=self.workspace, label='Stage', key='stage')
+
+    def create_tasks(self, count):
+        for index in range(count):
+            assignee = User.objects.create(username=f'assignee-{Task.objects.count()}')
+            task = Task.objects.create(
+                title=f'Task {index}', description='', workspace=self.workspace, owner=assignee,
+                category_key='category', stage_key='stage',
+            )
+            for _ in range(2):
+                comment = TaskComment.objects.create(task=task, author=assignee, content='Comment')
+                workspace_file = WorkspaceFile.objects.create(
+                    workspace=self.workspace, file_key='key', file_name='file.png',
+                    content_type='image/png', file_size=1, created_by=assignee,
+                )
+                TaskCommentFile.objects.create(comment=comment, file=workspace_file, task=task, owner=assignee)
+
+    def test_list_query_count_does_not_grow_with_tasks(self):
+        url = f'/api/workspaces/{self.workspace.id}/tasks/'
+        self.create_tasks(3)
+        # Loads the workspace's categories and stages into Redis
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(len(response.json()), 3)
+
+        self.create_tasks(12)
+        with self.assertNumQueries(len(queries)):
+            response = self.client.get(url)
+        self.assertEqual(len(response.json()), 15)
+        self.assertEqual(len(response.json()[0]['comment_files']), 2)
+
+
+class SparseFieldsetTests(WorkspaceTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = f'/api/workspaces/{self.workspace.id}/tasks/'
+        Task.objects.create(title='Task', description='', workspace=self.workspace, owner=self.user)
+
+    def test_fields_and_expand(self):
+        task = self.client.get(self.url, {'fields': 'id,title', 'expand': 'owner'}).json()[0]
+        self.assertEqual(set(task), {'id', 'title', 'owner'})
+
+    def test_expand_without_fields(self):
+        task = self.client.get(self.url, {'expand': 'owner'}).json()[0]
+        self.assertIn('owner', task)
+        self.assertIn('title', task)
+        self.assertNotIn('comment_files', task)
+        self.assertNotIn('workspace', task)
+
+class WorkspaceChangesTests(WorkspaceTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = f'/api/workspaces/{self.workspace.id}/changes'
+        self.task = Task.objects.create(title='Task', description='', workspace=self.workspace, owner=self.user)
+        self.comment = TaskComment.objects.create(task=self.task, author=self.user, content='Comment')
+        workspace_file = WorkspaceFile.objects.create(
+            workspace=self.workspace, file_key='key', file_name='file.png',
+            content_type='image/png', file_size=1, created_by=self.user,
+        )
+        TaskCommentFile.objects.create(comment=self.comment, file=workspace_file, task=self.task, owner=self.user)
+        # Out of the overlap window
+        an_hour_ago = timezone.now() - datetime.timedelta(hours=1)
+        Task.objects.update(updated_at=an_hour_ago)
+        TaskComment.objects.update(updated_at=an_hour_ago)
+        TaskCommentFile.objects.update(created_at=an_hour_ago)
+
+    def test_deleted_comment_resends_its_task(self):
+        since = int(timezone.now().timestamp() * 1000)
+        comment_id = self.comment.id
+        self.comment.delete()
+
+        data = self.client.get(self.url, {'since': since}).json()
+        self.assertEqual(data['deleted']['comments'], [{'id': str(comment_id), 'task': str(self.task.id)}])
+        self.assertEqual([task['id'] for task in data['tasks']], [str(self.task.id)])
+        self.assertEqual(data['tasks'][0]['comment_files'], [])
+
+    def test_responsible_changes_resend_their_chore(self):
+        chore = Chore.objects.create(title='Chore', workspace=self.workspace)
+        Chore.objects.update(updated_at=timezone.now() - datetime.timedelta(hours=1))
+        since = int(timezone.now().timestamp() * 1000)
+
+        responsible = ChoreResponsible.objects.create(chore=chore, user=self.user)
+        data = self.client.get(self.url, {'since': since}).json()
+        self.assertEqual([item['id'] for item in data['chores']], [str(chore.id)])
+        self.assertEqual(len(data['chores'][0]['responsibles']), 1)
+
+        Chore.objects.update(updated_at=timezone.now() - datetime.timedelta(hours=1))
+        since = int(timezone.now().timestamp() * 1000)
+        responsible.delete()
+        data = self.client.get(self.url, {'since': since}).json()
+        self.assertEqual(data['chores'][0]['responsibles'], [])
+
+    def test_invalid_since(self):
+        for since in ('abc', '99999999999999999999', '-99999999999999999999'):
+            with self.subTest(since):
+                self.assertEqual(self.client.get(self.url, {'since': since}).status_code, 400)
+
+
+class BulkWriteTests(WorkspaceTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = f'/api/workspaces/{self.workspace.id}/tasks/bulk/'
+        self.tasks = [
+            Task.objects.create(title=f'Task {index}', description='', workspace=self.workspace)
+            for index in range(2)
+        ]
+        # Summaries are queued to the LLM worker's Redis
+        patcher = mock.patch('portal.api.views.task.queue_task_summaries')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def patch(self, items):
+        return self.client.patch(self.url, items, content_type='application/json')
+
+    def test_bulk_update(self):
+        response = self.patch([{'id': str(task.id), 'title': 'Renamed'} for task in self.tasks])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(Task.objects.values_list('title', flat=True)), {'Renamed'})
+
+    def test_bulk_update_rows_filtered_out_roll_back(self):
+        bulk_update = QuerySet.bulk_update
+
+        # As an RLS UPDATE policy hiding the second row would
+        def update_first(queryset, objs, fields, **kwargs):
+            return bulk_update(queryset, objs[:1], fields, **kwargs)
+
+        with mock.patch.object(QuerySet, 'bulk_update', autospec=True, side_effect=update_first):
+            response = self.patch([{'id': str(task.id), 'title': 'Renamed'} for task in self.tasks])
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(sorted(Task.objects.values_list('title', flat=True)), ['Task 0', 'Task 1'])
+
+    def test_bulk_submit_assignments_filtered_out_roll_back(self):
+        chore = Chore.objects.create(title='Chore', workspace=self.workspace)
+        assignments = [
+            ChoreAssigned.objects.create(workspace=self.workspace, chore=chore, user=User.objects.create(username=f'user-{index}'))
+            for index in range(2)
+        ]
+        url = f'/api/workspaces/{self.workspace.id}/assignments/submissions/bulk/'
+        items = [{'chore_assigned': str(assignment.id), 'status': 'done'} for assignment in assignments]
+        bulk_update = QuerySet.bulk_update
+
+        def update_first(queryset, objs, fields, **kwargs):
+            return bulk_update(queryset, objs[:1], fields, **kwargs)
+
+        with mock.patch.object(QuerySet, 'bulk_update', autospec=True, side_effect=update_first):
+            response = self.client.post(url, items, content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(ChoreAssignmentSubmission.objects.exists())
+        self.assertEqual(set(ChoreAssigned.objects.values_list('status', flat=True)), {'pending'})
+
+        response = self.client.post(url, items, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(set(ChoreAssigned.objects.values_list('status', flat=True)), {'done'})
+
+
+class KeyUpsertTests(WorkspaceTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        Category.objects.create(workspace=self.workspace, label='Bugs', key='bugs')
+        self.key = CATEGORIES_KEY.format(workspace_id=self.workspace.id)
+
+    def test_upsert_bumps_categories(self):
+        organization_id = self.workspace.organization_id
+        for emoji, url in enumerate((
+            f'/api/workspaces/{self.workspace.id}/categories/upsert/',
+            f'/api/organizations/{organization_id}/workspaces/{self.workspace.id}/categories/upsert/',
+        )):
+            with self.subTest(url):
+                # Cached under the current version
+                workspace_taxonomy(self.workspace.id)
+                version = versioner.get(self.key)
+                response = self.client.put(url, [{'label': 'Bugs', 'emoji': str(emoji)}], content_type='application/json')
+                self.assertEqual(response.status_code, 200)
+                self.assertGreater(versioner.get(self.key), version)
+                self.assertEqual(workspace_taxonomy(self.workspace.id)['categories']['bugs']['emoji'], str(emoji))
+
+
+class TaskCommentFileDownloadTests(WorkspaceTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        task = Task.objects.create(title='Task', description='', workspace=self.workspace)
+        comment = TaskComment.objects.create(task=task, author=self.user, content='Comment')
+        self.workspace_file = WorkspaceFile.objects.create(
+            workspace=self.workspace, file_key='key', file_name='file.png',
+            content_type='image/png', file_size=4, created_by=self.user,
+        )
+        comment_file = TaskCommentFile.objects.create(comment=comment, file=self.workspace_file, task=task, owner=self.user)
+        self.url = f'/api/tasks/{task.id}/files/{comment_file.id}'
+        minio_client = mock.Mock()
+        minio_client.get_object.side_effect = lambda **params: {'Body': iter([b'data'])}
+        patcher = mock.patch('portal.api.views.task.get_minio_client', return_value=minio_client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get_small(self, derivatives):
+        WorkspaceFile.objects.filter(id=self.workspace_file.id).update(derivatives=derivatives)
+        return self.client.get(self.url, {'size': 'small'})
+
+    def test_pending_derivative_is_not_cached(self):
+        response = self.get_small({})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+
+    def test_original_fitting_the_size_is_cached(self):
+        response = self.get_small({'small': None, 'medium': None})
+        self.assertEqual(response['Cache-Control'], 'public, max-age=2592000')
+
+    def test_derivative_is_cached(self):
+        response = self.get_small({'small': {
+            'key': 'key.small.webp', 'content_type': 'image/webp', 'file_size': 4, 'width': 1, 'height': 1,
+        }})
+        self.assertEqual(response['Cache-Control'], 'public, max-age=2592000')
+        self.assertEqual(response['Content-Type'], 'image/webp')
+        self.assertTrue(response['ETag'].endswith('-small"'))
+
+
+class ORJSONParityTests(SimpleTestCase):
+    """ORJSONRenderer/ORJSONParser must behave exactly like DRF's JSONRenderer/JSONParser."""
+
+    def assertRendersSame(self, data, accepted_media_type='application/json'):
+        self.assertEqual(
+            ORJSONRenderer().render(data, accepted_media_type),
+            JSONRenderer().render(data, accepted_media_type),
+        )
+
+    def test_render_types(self):
+        payloads = {
+            'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'decimal': Decimal('12.50'),
+            'datetime_utc': datetime.datetime(2026, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc),
+            'datetime_offset': datetime.datetime(2026, 1, 2, 3, 4, 5, tzinfo=datetime.timezone(datetime.timedelta(hours=-3))),
+            'datetime_microseconds': datetime.datetime(2026, 1, 2, 3, 4, 5, 123456, tzinfo=datetime.timezone.utc),
+            'datetime_naive': datetime.datetime(2026, 1, 2, 3, 4, 5),
+            'date': datetime.date(2026, 1, 2),
+            'time': datetime.time(3, 4, 5),
+            'timedelta': datetime.timedelta(days=1, seconds=5),
+            'lazy': gettext_lazy('Workspace'),
+            'unicode': 'caf\u00e9 \u2028 \u2029 \U0001f600',
+            'numbers': [0, -1, 1.5, 10 ** 18, True, None],
+            'int_keys': {1: 'one', 2: 'two'},
+            'empty': [{}, [], ''],
+        }
+        for name, value in payloads.items():
+            with self.subTest(name):
+                self.assertRendersSame({'value': value})
+
+    def test_render_nested_serializer_data(self):
+        item = ReturnDict({'id': uuid.uuid4(), 'tags': ReturnList(['a', 'b'], serializer=None)}, serializer=None)
+        self.assertRendersSame(ReturnList([item, ReturnDict({'nested': item}, serializer=None)], serializer=None))
+
+    def test_render_big_integers(self):
+        for value in (2 ** 64, -2 ** 63 - 1, 10 ** 30):
+            with self.subTest(value):
+                self.assertRendersSame({'value': [value]})
+
+    def test_render_none(self):
+        self.assertRendersSame(None)
+
+    def test_render_indented(self):
+        self.assertRendersSame({'a': [1, {'b': 2}]}, 'application/json; indent=2')
+
+    def parse(self, parser, content, encoding='utf-8'):
+        return parser.parse(io.BytesIO(content), parser_context={'encoding': encoding})
+
+    def test_parse_valid(self):
+        for content in (
+            b'{"a": [1, 2.5, "x", true, null], "b": {"c": "caf\xc3\xa9"}}',
+            b'[]',
+            b'"\\u2028"',
+            b'12345678901234567890',
+        ):
+            with self.subTest(content):
+                self.assertEqual(self.parse(ORJSONParser(), content), self.parse(JSONParser(), content))
+
+    def test_parse_big_integers(self):
+        for value in (2 ** 64 + 1, -2 ** 63 - 1, 10 ** 30 + 1):
+            content = b'{"a": [%d]}' % value
+            with self.subTest(value):
+                parsed = self.parse(ORJSONParser(), content)
+                self.assertEqual(parsed, self.parse(JSONParser(), content))
+                self.assertIs(type(parsed['a'][0]), int)
+                self.assertEqual(parsed['a'][0], value)
+
+    def test_parse_other_encoding(self):
+        content = '{"name": "caf\u00e9"}'.encode('latin-1')
+        self.assertEqual(
+            self.parse(ORJSONParser(), content, 'latin-1'),
+            self.parse(JSONParser(), content, 'latin-1'),
+        )
+
+    def test_parse_invalid(self):
+        for content in (b'', b'{', b'{"a": 1,}', b'NaN', b'[Infinity]', b'[-Infinity]', b'\xff'):
+            with self.subTest(content):
+                with self.assertRaises(ParseError):
+                    self.parse(JSONParser(), content)
+                with self.assertRaises(ParseError):
+                    self.parse(ORJSONParser(), content)
@@ -6,7 +6,7 @@ from rest_framework_nested import routers
 from portal.api.views.task import TaskCommentDetailedViewSet, TaskCommentFileViewSet, TaskDetailedViewSet, TaskSummaryViewSet
 from .views import (
     OrganizationViewSet, OrganizationMemberViewSet,
-    WorkspaceViewSet, WorkspaceMemberViewSet, WorkspaceInviteViewSet, AcceptInviteViewSet,
+    WorkspaceViewSet, WorkspaceMemberViewSet, WorkspaceInviteViewSet, AcceptInviteViewSet, WorkspaceChangesViewSet,
     CategoryViewSet, StageViewSet,
     TaskViewSet, TaskCommentViewSet, TaskFileViewSet,
     ChoreViewSet, ChoreResponsibleViewSet, ChoreAssignedViewSet, ChoreAssignmentSubmissionViewSet, ChoreAssignmentDetailedViewSet,
@@ -72,6 +72,7 @@ tasks_router.register(r'comments', TaskCommentViewSet, basename='comment')
 urlpatterns = [
     path('invite/<uuid:token>/accept/', AcceptInviteViewSet.as_view(), name='accept-invite'),
     path('workspaces/<uuid:ws_id>/tasks/<uuid:task_id>/comments/upload', TaskCommentFileViewSet.as_view(), name='task-file-upload'),
+    path('workspaces/<uuid:ws_id>/changes', WorkspaceChangesViewSet.as_view(), name='workspace-changes'),
     path('workspaces/<uuid:ws_id>/tasks/<uuid:task_id>/summary', TaskSummaryViewSet.as_view(), name='task-summary'),
     path('tasks/<uuid:task_id>/files/<uuid:file_id>', TaskCommentFileViewSet.as_view(), name='task-file-download'),
     path('tasks/<uuid:task_id>/files/<uuid:file_id>/<file_name>', TaskCommentFileViewSet.as_view(), name='task-file-download'),
@@ -3,5 +3,5 @@ from .chore import ChoreViewSet, ChoreResponsibleViewSet, ChoreAssignedViewSet,
 from .organization import OrganizationViewSet, OrganizationMemberViewSet
 from .stage import StageViewSet
 from .task import TaskViewSet, TaskCommentViewSet, TaskDetailedViewSet, TaskFileViewSet
-from .workspace import WorkspaceViewSet, WorkspaceMemberViewSet, WorkspaceInviteViewSet, AcceptInviteViewSet
+from .workspace import WorkspaceViewSet, WorkspaceMemberViewSet, WorkspaceInviteViewSet, AcceptInviteViewSet, WorkspaceChangesViewSet
 
@@ -1,15 +1,18 @@
 import logging
-from rest_framework.decorators import action
-from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
-from portal.workspace.models import Category, Workspace
-from portal.api.serializers import CategorySerializer
+from portal.api.taxonomy import CATEGORIES_KEY
+from portal.api.views.mixins import KeyUpsertMixin
+from portal.workspace.models import Category
+from portal.api.serializers import CategorySerializer, CategoryUpsertSerializer
 
 logger = logging.getLogger(__name__)
 
-class CategoryViewSet(ModelViewSet):
+class CategoryViewSet(KeyUpsertMixin, ModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    upsert_serializer_class = CategoryUpsertSerializer
+    upsert_fields = ('label', 'emoji')
+    upsert_resource_key = CATEGORIES_KEY
 
     def get_queryset(self):
         queryset = Category.objects.all()
@@ -19,28 +22,3 @@ class CategoryViewSet(ModelViewSet):
     def perform_create(self, serializer):
         logger.info(f"User {self.request.user.username} creating category in workspace {self.kwargs['ws_pk']}")
         serializer.save(workspace_id=self.kwargs['ws_pk'])
-
-    @action(detail=False, methods=['put'], url_path='upsert')
-    def upsert(self, request, ws_pk):
-        ws = Workspace.objects.get(id=ws_pk)
-        items = request.data
-        queryset = Category.objects.all()
-
-        categories = queryset.filter(workspace_id=ws.id)
-
-        results = []
-        for data in items:
-            data['workspace'] = ws.id
-            if 'id' in data and Category.objects.filter(id=data['id']).exists():
-                category = categories.get(id=data['id'])
-                serializer = CategorySerializer(category, data=data, partial=True)
-            else:
-                serializer = CategorySerializer(data=data)
-
-            if serializer.is_valid():
-                serializer.save()
-                results.append(serializer.data)
-            else:
-                return Response(serializer.errors, status=400)
-
-        return Response(results, status=200)
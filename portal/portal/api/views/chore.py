@@ -1,10 +1,17 @@
 import logging
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
+from portal.api.pagination import UpdatedAtCursorPagination
+from portal.api.serializers.compiled import CompiledChoreAssignmentDetailedSerializer
+from portal.api.views.mixins import BulkWriteMixin, CompiledSerializerMixin, SparseFieldsetMixin
 from portal.workspace.models import Chore, ChoreResponsible, ChoreAssigned, ChoreAssignmentSubmission
 from portal.api.serializers import (
     ChoreDetailedSerializer, ChoreSerializer, ChoreResponsibleSerializer,
     ChoreAssignedSerializer, ChoreAssignmentSubmissionSerializer,
-    ChoreAssignmentDetailedSerializer
+    ChoreAssignmentDetailedSerializer, ChoreAssignedBulkSerializer, ChoreAssignmentSubmissionBulkSerializer,
 )
 
 logger = logging.getLogger(__name__)
@@ -12,6 +19,7 @@ logger = logging.getLogger(__name__)
 class ChoreViewSet(ModelViewSet):
     queryset = Chore.objects.all()
     serializer_class = ChoreSerializer
+    pagination_class = UpdatedAtCursorPagination
 
     def get_queryset(self):
         queryset = Chore.objects.all()
@@ -79,7 +87,7 @@ class ChoreAssignmentSubmissionViewSet(ModelViewSet):
         logger.info(f"User {self.request.user.username} submitting to chore assignment {self.kwargs['assigned_pk']}")
         serializer.save(chore_assigned_id=self.kwargs['assigned_pk'], user=self.request.user)
 
-class ChoreDetailedViewSet(ChoreViewSet):
+class ChoreDetailedViewSet(SparseFieldsetMixin, ChoreViewSet):
     """
     A ViewSet for viewing detailed Chore instances.
     This viewset provides read-only operations (list, retrieve)
@@ -92,6 +100,19 @@ class ChoreDetailedViewSet(ChoreViewSet):
     """
     queryset = Chore.objects.all()
     serializer_class = ChoreDetailedSerializer
+    field_columns = {
+        'id': ('id',),
+        'title': ('title',),
+        'description': ('description',),
+        'created_at': ('created_at',),
+        'updated_at': ('updated_at',),
+        'workspace': ('workspace__label',),
+        'category': ('workspace', 'category_key'),
+        'category_key': ('category_key',),
+        'responsibles': (),
+        'recurrence': ('recurrence',),
+        'schedule': ('schedule',),
+    }
 
     def get_serializer_class(self):
         if self.action in ['list', 'retrieve']:
@@ -103,9 +124,14 @@ class ChoreDetailedViewSet(ChoreViewSet):
         ws_id = self.kwargs.get('ws_pk', None)
         if ws_id:
             queryset = queryset.filter(workspace_id=ws_id)
-        return queryset
-
-class ChoreAssignmentDetailedViewSet(ReadOnlyModelViewSet):
+        # Categories are resolved through the workspace taxonomy map
+        if self.is_field_selected('workspace'):
+            queryset = queryset.select_related('workspace')
+        if self.is_field_selected('responsibles'):
+            queryset = queryset.prefetch_related('responsibles__user')
+        return self.apply_sparse_fields(queryset)
+
+class ChoreAssignmentDetailedViewSet(BulkWriteMixin, SparseFieldsetMixin, CompiledSerializerMixin, ReadOnlyModelViewSet):
     """
     A ViewSet for viewing detailed ChoreAssignment instances.
     This viewset provides read-only operations (list, retrieve)
@@ -118,6 +144,23 @@ class ChoreAssignmentDetailedViewSet(ReadOnlyModelViewSet):
     """
     queryset = ChoreAssigned.objects.all()
     serializer_class = ChoreAssignmentDetailedSerializer
+    compiled_serializer_class = CompiledChoreAssignmentDetailedSerializer
+    bulk_serializer_class = ChoreAssignedBulkSerializer
+    pagination_class = UpdatedAtCursorPagination
+    field_columns = {
+        'id': ('id',),
+        'workspace': ('workspace__label',),
+        'chore': (
+            'chore__title', 'chore__description', 'chore__recurrence',
+            'chore__category_key', 'chore__workspace',
+        ),
+        'user': ('user__username', 'user__first_name'),
+        'status': ('status',),
+        'closed': ('closed',),
+        'assigned_at': ('assigned_at',),
+        'updated_at': ('updated_at',),
+        'submissions': (),
+    }
 
     def get_queryset(self):
         queryset = ChoreAssigned.objects.all()
@@ -127,5 +170,64 @@ class ChoreAssignmentDetailedViewSet(ReadOnlyModelViewSet):
             queryset = queryset.filter(workspace_id=ws_id)
         if user_id:
             queryset = queryset.filter(user_id=user_id)
-
-        return queryset.order_by('-updated_at')
+        for relation in ['workspace', 'chore', 'user']:
+            if self.is_field_selected(relation):
+                queryset = queryset.select_related(relation)
+        if self.is_field_selected('submissions'):
+            queryset = queryset.prefetch_related('submissions')
+        queryset = self.apply_sparse_fields(queryset)
+
+        return queryset.order_by('-updated_at', '-id')
+
+    def get_serializer_context(self):
+        return {**super().get_serializer_context(), 'workspace_id': self.kwargs.get('ws_pk')}
+
+    def get_bulk_queryset(self):
+        return ChoreAssigned.objects.filter(workspace_id=self.kwargs['ws_pk'])
+
+    def get_bulk_save_kwargs(self):
+        return {'workspace_id': self.kwargs['ws_pk']}
+
+    def prepare_bulk_instance(self, assignment):
+        assignment.update_closed()
+        return ['closed']
+
+    @action(detail=False, methods=['post'], url_path='submissions/bulk')
+    def bulk_submit(self, request, ws_pk):
+        """
+        Creates many submissions at once (e.g. "mark all done") in one
+        transaction, moving each assignment to the status of its last
+        submission as ChoreAssignmentSubmission.save does.
+        """
+        items = request.data
+        error = self.check_bulk_items(items)
+        if error is not None:
+            return error
+
+        now = timezone.now()
+        submissions, assignments, errors = [], {}, []
+        for item in items:
+            serializer = ChoreAssignmentSubmissionBulkSerializer(data=item, context=self.get_serializer_context())
+            if not serializer.is_valid():
+                errors.append(serializer.errors)
+                continue
+            submission = ChoreAssignmentSubmission(**serializer.validated_data, user=request.user)
+            assignment = assignments.setdefault(submission.chore_assigned_id, submission.chore_assigned)
+            assignment.status = submission.status
+            assignment.update_closed()
+            assignment.updated_at = now
+            submissions.append(submission)
+            errors.append({})
+        if any(errors):
+            return Response(errors, status=400)
+
+        logger.info(f"User {request.user.username} submitting to {len(assignments)} chore assignments in workspace {ws_pk}")
+        with transaction.atomic():
+            ChoreAssignmentSubmission.objects.bulk_create(submissions)
+            # All or nothing, as in BulkWriteMixin.bulk
+            if ChoreAssigned.objects.bulk_update(list(assignments.values()), ['status', 'closed', 'updated_at']) != len(assignments):
+                transaction.set_rollback(True)
+                return Response({'error': 'Not allowed to update every item'}, status=403)
+
+        serializer = ChoreAssignmentSubmissionBulkSerializer(submissions, many=True, context=self.get_serializer_context())
+        return Response(serializer.data, status=201)
@@ -0,0 +1,289 @@
+import logging
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from portal.cache.middleware import add_resource_keys
+from portal.workspace.models import Workspace
+
+logger = logging.getLogger(__name__)
+
+
+class CompiledSerializerMixin:
+    """
+    Serves list/retrieve with `compiled_serializer_class` (see
+    portal.api.serializers.compiled) when ``PORTAL_API['COMPILED_SERIALIZERS']``
+    is on; every other action keeps the regular serializer class.
+    """
+    compiled_serializer_class = None
+
+    def get_serializer_class(self):
+        if (self.compiled_serializer_class is not None
+                and self.action in ['list', 'retrieve']
+                and settings.PORTAL_API.get('COMPILED_SERIALIZERS', False)):
+            return self.compiled_serializer_class
+        return super().get_serializer_class()
+
+
+class SparseFieldsetMixin:
+    """
+    Lets list/retrieve clients pick the serialized fields with
+    ``?fields=id,title,stage_key``; relations can also be named in
+    ``?expand=owner,comment_files`` on top of ``fields``. ``expand`` alone
+    adds them to the plain (non-relation) fields. With neither, every field
+    is returned, as before.
+
+    `field_columns` maps each serializer field to the model columns it reads
+    (``relation__column`` for select_related ones, none for prefetched
+    ones): only the columns of the selected fields are loaded, and
+    get_queryset skips joins/prefetches of unselected relations through
+    `is_field_selected`.
+    """
+    field_columns = {}
+
+    def get_sparse_fields(self):
+        """Selected field names, or None for all of them."""
+        if not hasattr(self, '_sparse_fields'):
+            self._sparse_fields = None
+            if self.action not in ['list', 'retrieve']:
+                return None
+            fields = self.request.query_params.get('fields')
+            expand = self.request.query_params.get('expand', '')
+            if not fields and expand:
+                fields = ','.join(
+                    name for name, columns in self.field_columns.items()
+                    if columns and not any('__' in column for column in columns)
+                )
+            if fields:
+                self._sparse_fields = {
+                    name.strip() for name in f'{fields},{expand}'.split(',')
+                    if name.strip() in self.field_columns
+                }
+        return self._sparse_fields
+
+    def is_field_selected(self, name):
+        fields = self.get_sparse_fields()
+        return fields is None or name in fields
+
+    def apply_sparse_fields(self, queryset):
+        """Restrict `queryset` to the columns of the selected fields."""
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return queryset
+        columns = {'id'}
+        # Pagination reads the cursor position from the instances
+        ordering = getattr(self.pagination_class, 'ordering', None) or ()
+        columns.update(field.lstrip('-') for field in ordering)
+        for name in fields:
+            columns.update(self.field_columns[name])
+        return queryset.only(*columns)
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            kwargs['fields'] = fields
+        return super().get_serializer(*args, **kwargs)
+
+
+class BulkWriteMixin:
+    """
+    ``POST <list>/bulk/`` creates and ``PATCH <list>/bulk/`` partially
+    updates (by ``id``) a list of rows, validated one by one with
+    `bulk_serializer_class` and written in one transaction through
+    bulk_create/bulk_update. Nothing is written unless every item is valid;
+    errors come back as a list aligned with the items.
+
+    bulk_create/bulk_update skip save() and model signals: viewsets report
+    the resources to invalidate in `get_bulk_resource_keys` (bumped once, by
+    CacheTimestampMiddleware, along with the request path) and queue
+    downstream work once in `perform_bulk`.
+    """
+    bulk_serializer_class = None
+
+    def get_bulk_serializer(self, *args, **kwargs):
+        kwargs.setdefault('context', self.get_serializer_context())
+        return self.bulk_serializer_class(*args, **kwargs)
+
+    def get_bulk_queryset(self):
+        """Rows `PATCH` may update, without the list's joins and prefetches."""
+        return self.get_queryset()
+
+    def get_bulk_save_kwargs(self):
+        """Attributes set on created rows, as perform_create passes to save()."""
+        return {}
+
+    def get_bulk_resource_keys(self, instances):
+        return []
+
+    def prepare_bulk_instance(self, instance):
+        """Hook standing in for save() overrides, returns the extra fields it set."""
+        return []
+
+    def perform_bulk(self, instances, created):
+        """Runs once the rows are committed."""
+        pass
+
+    def check_bulk_items(self, items):
+        """Error response if `items` is not a list of at most BULK_MAX_ITEMS objects."""
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            return Response({'error': 'Expected a list of objects'}, status=400)
+        max_items = settings.PORTAL_API.get('BULK_MAX_ITEMS', 500)
+        if len(items) > max_items:
+            return Response({'error': f'At most {max_items} items per request'}, status=400)
+        return None
+
+    @action(detail=False, methods=['post', 'patch'], url_path='bulk')
+    def bulk(self, request, **kwargs):
+        items = request.data
+        error = self.check_bulk_items(items)
+        if error is not None:
+            return error
+
+        created = request.method == 'POST'
+        if created:
+            instances, fields, errors = self.build_bulk_create(items)
+        else:
+            instances, fields, errors = self.build_bulk_update(items)
+        if any(errors):
+            return Response(errors, status=400)
+
+        model = self.get_bulk_queryset().model
+        with transaction.atomic():
+            if created:
+                model.objects.bulk_create(instances)
+            elif instances:
+                # RLS UPDATE policies skip rows silently, unlike SELECT ones
+                # they can be stricter than: all or nothing
+                if model.objects.bulk_update(instances, fields) != len(instances):
+                    transaction.set_rollback(True)
+                    return Response({'error': 'Not allowed to update every item'}, status=403)
+        self.perform_bulk(instances, created)
+
+        add_resource_keys(request, self.get_bulk_resource_keys(instances))
+        data = self.get_bulk_serializer(instances, many=True).data
+        return Response(data, status=201 if created else 200)
+
+    def build_bulk_create(self, items):
+        model = self.get_bulk_queryset().model
+        save_kwargs = self.get_bulk_save_kwargs()
+        instances, errors = [], []
+        for item in items:
+            serializer = self.get_bulk_serializer(data=item)
+            if not serializer.is_valid():
+                errors.append(serializer.errors)
+                continue
+            instance = model(**serializer.validated_data, **save_kwargs)
+            self.prepare_bulk_instance(instance)
+            instances.append(instance)
+            errors.append({})
+        return instances, None, errors
+
+    def build_bulk_update(self, items):
+        queryset = self.get_bulk_queryset()
+        pk_field = queryset.model._meta.pk
+        ids = []
+        for item in items:
+            try:
+                ids.append(pk_field.to_python(item.get('id')))
+            except ValidationError:
+                ids.append(None)
+        existing = queryset.in_bulk([pk for pk in ids if pk is not None])
+        auto_now = [field for field in queryset.model._meta.concrete_fields if getattr(field, 'auto_now', False)]
+        now = timezone.now()
+
+        instances, fields, errors = {}, set(), []
+        for pk, item in zip(ids, items):
+            instance = existing.get(pk)
+            if instance is None:
+                errors.append({'id': ['Not found.']})
+                continue
+            serializer = self.get_bulk_serializer(instance, data=item, partial=True)
+            if not serializer.is_valid():
+                errors.append(serializer.errors)
+                continue
+            for attr, value in serializer.validated_data.items():
+                setattr(instance, attr, value)
+            fields.update(serializer.validated_data)
+            fields.update(self.prepare_bulk_instance(instance))
+            # auto_now is only applied by save()
+            for field in auto_now:
+                setattr(instance, field.attname, now)
+                fields.add(field.name)
+            instances[pk] = instance  # Repeated ids update the same row
+            errors.append({})
+        return list(instances.values()), sorted(fields), errors
+
+
+class KeyUpsertMixin:
+    """
+    ``PUT <list>/upsert/`` for models unique on (workspace, key), such as
+    categories and stages: every item is validated with
+    `upsert_serializer_class`, then all rows are written by a single
+    ``INSERT ... ON CONFLICT (workspace_id, key) DO UPDATE``.
+
+    Items with the id of an existing row are partial updates and keep its
+    key (renaming does not change it), others get the key derived from their
+    label as save() does.
+    An item whose key already exists updates that row's `upsert_fields`;
+    when several items share a key the last one wins.
+
+    bulk_create skips save() and the PORTAL_CACHE_SIGNALS bumps with it:
+    `upsert_resource_key` (formatted with ``workspace_id``) is reported to
+    CacheTimestampMiddleware instead.
+    """
+    upsert_serializer_class = None
+    upsert_fields = ()
+    upsert_resource_key = None
+
+    @action(detail=False, methods=['put'], url_path='upsert')
+    def upsert(self, request, ws_pk, **kwargs):
+        ws = Workspace.objects.get(id=ws_pk)
+        items = request.data
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            return Response({'error': 'Expected a list of objects'}, status=400)
+
+        model = self.get_queryset().model
+        pk_field = model._meta.pk
+        ids = []
+        for item in items:
+            try:
+                ids.append(pk_field.to_python(item.get('id')))
+            except ValidationError:
+                ids.append(None)
+        existing = model.objects.filter(workspace_id=ws.id).in_bulk([pk for pk in ids if pk is not None])
+
+        rows = {}
+        for pk, item in zip(ids, items):
+            instance = existing.get(pk)
+            # Existing rows are updated partially, as PATCH would
+            serializer = self.upsert_serializer_class(instance, data=item, partial=instance is not None)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=400)
+            if instance is not None:
+                values = {field: getattr(instance, field) for field in self.upsert_fields}
+                values.update(serializer.validated_data)
+                key = instance.key
+            else:
+                values = serializer.validated_data
+                key = slugify(values['label'])[:255]
+            rows.pop(key, None)  # Keep the order of the last occurrence
+            rows[key] = model(**values, key=key, workspace=ws)
+
+        logger.info(f"User {request.user.username} upserting {len(rows)} {model._meta.verbose_name_plural} in workspace {ws.id}")
+        model.objects.bulk_create(
+            list(rows.values()),
+            update_conflicts=True,
+            unique_fields=['workspace', 'key'],
+            update_fields=list(self.upsert_fields),
+        )
+        if rows and self.upsert_resource_key:
+            add_resource_keys(request, [self.upsert_resource_key.format(workspace_id=ws.id)])
+        # Conflicting rows keep their own id, which the generated UUIDs do
+        # not reflect: read the rows back as stored
+        stored = {instance.key: instance for instance in model.objects.filter(workspace_id=ws.id, key__in=rows)}
+        instances = [stored[key] for key in rows if key in stored]
+        return Response(self.upsert_serializer_class(instances, many=True).data, status=200)
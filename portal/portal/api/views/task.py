@@ -1,23 +1,33 @@
 import logging
 import uuid
-from django.http import StreamingHttpResponse
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Prefetch
+from django.http import HttpResponse, HttpResponseNotModified, HttpResponseRedirect, StreamingHttpResponse
 from rest_framework.views import APIView, Response
 from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
+from portal.api.pagination import CreatedAtCursorPagination, UpdatedAtCursorPagination
+from portal.api.serializers.compiled import CompiledTaskDetailedSerializer, CompiledTaskFileSerializer
+from portal.api.views.mixins import BulkWriteMixin, CompiledSerializerMixin, SparseFieldsetMixin
 from portal.api.serializers.task import TaskFileSerializer, TaskSummarySerializer
 from portal.workspace.models import Task, TaskComment, TaskCommentFile
 from portal.api.serializers import (
     TaskCommentDetailedSerializer, TaskSerializer, TaskCommentSerializer,
-    TaskDetailedSerializer,
+    TaskDetailedSerializer, TaskBulkSerializer,
 )
-from portal.storage.minio_client import get_minio_client
+from portal.storage.blobs import BUCKET, content_key, ensure_stored, find_content, release
+from portal.storage.minio_client import get_minio_client, presigned_get_url, upload_fileobj
+from portal.storage.ranges import UNSATISFIABLE_RANGE, etag_matches, parse_range
 from portal.storage.models import WorkspaceFile
 from portal.llm.models import TaskSummary
+from portal.llm.signals import queue_task_summaries
 
 logger = logging.getLogger(__name__)
 
 class TaskViewSet(ModelViewSet):
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
+    pagination_class = UpdatedAtCursorPagination
 
     def get_queryset(self):
         queryset = Task.objects.all()
@@ -50,7 +60,7 @@ class TaskCommentViewSet(ModelViewSet):
         serializer.save(task_id=self.kwargs['task_pk'], author=self.request.user)
 
 
-class TaskDetailedViewSet(TaskViewSet):
+class TaskDetailedViewSet(BulkWriteMixin, SparseFieldsetMixin, CompiledSerializerMixin, TaskViewSet):
     """
     A ViewSet for viewing detailed Task instances.
     This viewset provides read-only operations (list, retrieve)
@@ -63,11 +73,27 @@ class TaskDetailedViewSet(TaskViewSet):
     """
     queryset = Task.objects.all()
     serializer_class = TaskDetailedSerializer
+    compiled_serializer_class = CompiledTaskDetailedSerializer
+    bulk_serializer_class = TaskBulkSerializer
+    field_columns = {
+        'id': ('id',),
+        'title': ('title',),
+        'description': ('description',),
+        'created_at': ('created_at',),
+        'updated_at': ('updated_at',),
+        'workspace': ('workspace__label',),
+        'category': ('workspace', 'category_key'),
+        'category_key': ('category_key',),
+        'stage': ('workspace', 'stage_key'),
+        'stage_key': ('stage_key',),
+        'owner': ('owner__username', 'owner__first_name'),
+        'comment_files': (),
+    }
 
     def get_serializer_class(self):
-        # Use TaskDetailedSerializer for list and retrieve, TaskSerializer for others
+        # Use TaskDetailedSerializer (or its compiled version) for list and retrieve, TaskSerializer for others
         if self.action in ['list', 'retrieve']:
-            return TaskDetailedSerializer
+            return super().get_serializer_class()
         return TaskSerializer
 
     def get_queryset(self):
@@ -76,15 +102,42 @@ class TaskDetailedViewSet(TaskViewSet):
         ws_id = self.kwargs.get('ws_pk', None)
         if ws_id:
             queryset = queryset.filter(workspace_id=ws_id)
-        queryset = queryset.prefetch_related('comments')
-        queryset = queryset.select_related('owner')
-        queryset = queryset.order_by('-updated_at')
+        # Exactly what TaskDetailedSerializer walks (for the selected
+        # fields); categories and stages are resolved by key once per
+        # workspace in the serializer
+        if self.is_field_selected('owner'):
+            queryset = queryset.select_related('owner')
+        if self.is_field_selected('workspace'):
+            queryset = queryset.select_related('workspace')
+        if self.is_field_selected('comment_files'):
+            queryset = queryset.prefetch_related(Prefetch(
+                'comment_files',
+                queryset=TaskCommentFile.objects.select_related('file', 'owner'),
+            ))
+        queryset = self.apply_sparse_fields(queryset)
+        queryset = queryset.order_by('-updated_at', '-id')
         return queryset
 
+    def get_bulk_queryset(self):
+        return Task.objects.filter(workspace_id=self.kwargs['ws_pk'])
+
+    def get_bulk_save_kwargs(self):
+        return {'workspace_id': self.kwargs['ws_pk']}
+
+    def get_bulk_resource_keys(self, tasks):
+        # The path only covers the task list
+        ws_id = self.kwargs['ws_pk']
+        return [f'/api/workspaces/{ws_id}/tasks/{task.id}/*/' for task in tasks]
+
+    def perform_bulk(self, tasks, created):
+        logger.info(f"User {self.request.user.username} {'creating' if created else 'updating'} {len(tasks)} tasks in workspace {self.kwargs['ws_pk']}")
+        queue_task_summaries([task.id for task in tasks])
+
 
 class TaskCommentDetailedViewSet(TaskCommentViewSet):
     queryset = TaskComment.objects.all()
     serializer_class = TaskCommentDetailedSerializer
+    pagination_class = UpdatedAtCursorPagination
 
     def get_serializer_class(self):
         # Use TaskDetailedSerializer for list and retrieve, TaskSerializer for others
@@ -97,7 +150,7 @@ class TaskCommentDetailedViewSet(TaskCommentViewSet):
         task_id = self.kwargs.get('task_pk', None)
         if task_id:
             queryset = queryset.filter(task_id=task_id)
-        queryset = queryset.order_by('-updated_at')
+        queryset = queryset.order_by('-updated_at', '-id')
         return queryset
 
 class TaskCommentFileViewSet(APIView):
@@ -106,50 +159,64 @@ class TaskCommentFileViewSet(APIView):
         content = request.data.get('content', '')
         owner_id = request.user.id
 
-        task = Task.objects.get(id=task_id)
+        if getattr(request, 'upload_too_large', False):
+            return Response({'error': f"File larger than {settings.MINIO_UPLOAD['MAX_SIZE']} bytes"}, status=413)
 
-        # Create comment
-        comment = TaskComment.objects.create(
-            task=task,
-            content=content,
-            author_id=owner_id,
-        )
+        task = Task.objects.get(id=task_id)
         file_id = uuid.uuid4()
 
         if file:
-            # Generate unique file key
-            file_key = f"comments/{task_id}/{file_id}_{file.name}"
-            print(f"Processing file: {file_key}")
+            # Keyed by content: the same file uploaded again reuses the object
+            content_hash = request.upload_hashes['file']
+            file_key = content_key(task.workspace_id, content_hash)
+            existing = find_content(task.workspace_id, content_hash)
+            logger.info(f"User {request.user.username} uploading {file_key} ({file.size} bytes)")
+
+            # Streamed from the spooled upload, before any row exists
+            if existing is None:
+                try:
+                    upload_fileobj(file, BUCKET, file_key, content_type=file.content_type)
+                except Exception as e:
+                    return Response({'error': f'MinIO upload failed: {str(e)}'}, status=500)
 
-            # Upload to MinIO
-            minio_client = get_minio_client()
-            try:
-                minio_client.put_object(
-                    Bucket='workspace-task-files',
-                    Key=file_key,
-                    Body=file.read(),
-                    ContentType=file.content_type
+        try:
+            with transaction.atomic():
+                # Create comment
+                comment = TaskComment.objects.create(
+                    task=task,
+                    content=content,
+                    author_id=owner_id,
                 )
-            except Exception as e:
-                return Response({'error': f'MinIO upload failed: {str(e)}'}, status=500)
-
-            # Create WorkspaceFile
-            workspace_file = WorkspaceFile.objects.create(
-                workspace=comment.task.workspace,
-                file_key=file_key,
-                file_name=file.name,
-                content_type=file.content_type,
-                file_size=file.size,
-                created_by=request.user
-            )
-            # Create TaskCommentFile
-            TaskCommentFile.objects.create(
-                id=file_id,
-                comment=comment,
-                file=workspace_file,
-                task=task,
-                owner_id=owner_id,
-            )
+                if file:
+                    # Uploaded again if it was released in the meantime
+                    ensure_stored(file, file_key, content_type=file.content_type)
+                    # Create WorkspaceFile
+                    workspace_file = WorkspaceFile.objects.create(
+                        workspace_id=task.workspace_id,
+                        file_key=file_key,
+                        content_hash=content_hash,
+                        file_name=file.name,
+                        content_type=file.content_type,
+                        file_size=file.size,
+                        created_by=request.user,
+                        derivatives=existing.derivatives if existing else {},
+                    )
+                    # Create TaskCommentFile
+                    TaskCommentFile.objects.create(
+                        id=file_id,
+                        comment=comment,
+                        file=workspace_file,
+                        task=task,
+                        owner_id=owner_id,
+                    )
+        except Exception:
+            # Unless other rows reference the object
+            if file:
+                try:
+                    release(file_key)
+                except Exception:
+                    logger.exception(f"Failed to release {file_key}")
+            raise
 
         response_data = TaskCommentDetailedSerializer(comment).data
         return Response(response_data, status=201)
@@ -158,29 +225,85 @@ class TaskCommentFileViewSet(APIView):
         try:
             task = Task.objects.get(id=task_id)
 
-            file_obj = TaskCommentFile.objects.get(id=file_id)
-
-            minio_client = get_minio_client()
-            # Stream file from MinIO
-            response = minio_client.get_object(
-                Bucket='workspace-task-files',
-                Key=file_obj.file.file_key,
-            )
+            # RLS-protected lookup, the authorization for both modes
+            file_obj = TaskCommentFile.objects.select_related('file').get(id=file_id)
 
+            file_key = file_obj.file.file_key
+            file_name = file_obj.file.file_name
+            file_size = file_obj.file.file_size
             content_type = file_obj.file.content_type or 'application/octet-stream'
-            headers = {
-                'Cache-Control': 'public, max-age=2592000',
-                'ETag': f'"{file_id}"',
-            }
+            etag = f'"{file_id}"'
+            pending = False
+
+            # Resized copy, when the image was larger than the requested size
+            size = request.query_params.get('size')
+            if size:
+                if size not in settings.MINIO_DERIVATIVES['SIZES']:
+                    return Response({'error': f'Unknown size {size}'}, status=400)
+                derivative = file_obj.file.derivatives.get(size)
+                if derivative:
+                    file_key = derivative['key']
+                    file_name = f"{file_name.rsplit('.', 1)[0]}.webp"
+                    file_size = derivative['file_size']
+                    content_type = derivative['content_type']
+                    etag = f'"{file_id}-{size}"'
+                else:
+                    # Not generated yet: the original stands in, and must not
+                    # be kept under this URL once the copy exists
+                    pending = size not in file_obj.file.derivatives and content_type.startswith('image/')
 
             # Use inline for images, attachment for non-images
             if content_type.startswith('image/'):
-                headers['Content-Disposition'] = f'inline; filename="{file_obj.file.file_name}"'
+                content_disposition = f'inline; filename="{file_name}"'
+            else:
+                content_disposition = f'attachment; filename="{file_name}"'
+
+            if settings.MINIO_DOWNLOAD['MODE'] == 'redirect':
+                url = presigned_get_url(
+                    BUCKET,
+                    file_key,
+                    content_type=content_type,
+                    content_disposition=content_disposition,
+                )
+                response = HttpResponseRedirect(url)
+                # Followed again well before the URL expires
+                response['Cache-Control'] = 'no-cache' if pending else f"private, max-age={settings.MINIO_DOWNLOAD['URL_TTL'] // 2}"
+                return response
+
+            headers = {
+                'Cache-Control': 'no-cache' if pending else 'public, max-age=2592000',
+                'ETag': etag,
+                'Accept-Ranges': 'bytes',
+            }
+
+            # Files never change under an id: a matching ETag is enough
+            if etag_matches(request.headers.get('If-None-Match'), etag):
+                return HttpResponseNotModified(headers=headers)
+
+            byte_range = None
+            if_range = request.headers.get('If-Range')
+            if not if_range or if_range == etag:
+                byte_range = parse_range(request.headers.get('Range'), file_size)
+            if byte_range is UNSATISFIABLE_RANGE:
+                return HttpResponse(status=416, headers={'Content-Range': f'bytes */{file_size}'})
+
+            minio_client = get_minio_client()
+            params = {'Bucket': BUCKET, 'Key': file_key}
+            if byte_range:
+                params['Range'] = f'bytes={byte_range[0]}-{byte_range[1]}'
+            # Stream file from MinIO
+            response = minio_client.get_object(**params)
+
+            headers['Content-Disposition'] = content_disposition
+            if byte_range:
+                headers['Content-Range'] = f'bytes {byte_range[0]}-{byte_range[1]}/{file_size}'
+                headers['Content-Length'] = byte_range[1] - byte_range[0] + 1
             else:
-                headers['Content-Disposition'] = f'attachment; filename="{file_obj.file.file_name}"'
+                headers['Content-Length'] = file_size
 
             return StreamingHttpResponse(
                 response['Body'],
+                status=206 if byte_range else 200,
                 content_type=content_type,
                 headers=headers,
             )
@@ -191,19 +314,21 @@ class TaskCommentFileViewSet(APIView):
             return Response({'error': f'Failed to fetch file: {str(e)}'}, status=500)
 
 
-class TaskFileViewSet(ReadOnlyModelViewSet):
+class TaskFileViewSet(CompiledSerializerMixin, ReadOnlyModelViewSet):
     """
     ViewSet to list TaskCommentFile entries per workspace, including file details,
     task title, task category, comment content, workspace, and owner.
     """
     queryset = TaskCommentFile.objects.all()
     serializer_class = TaskFileSerializer
+    compiled_serializer_class = CompiledTaskFileSerializer
+    pagination_class = CreatedAtCursorPagination
 
     def get_queryset(self):
         ws_id = self.kwargs.get('ws_pk')
         queryset = TaskCommentFile.objects.filter(task__workspace_id=ws_id)
         queryset = queryset.select_related('file', 'task', 'comment', 'owner', 'task__workspace')
-        queryset = queryset.order_by('-created_at')
+        queryset = queryset.order_by('-created_at', '-id')
         return queryset
 
 class TaskSummaryViewSet(APIView):
@@ -1,11 +1,22 @@
 import logging
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.conf import settings
 from django.db import connection
+from django.db.models import Prefetch, Q
+from django.utils import timezone
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
-from portal.workspace.models import Workspace, WorkspaceMember, WorkspaceInvite, Organization
-from portal.api.serializers import WorkspaceSerializer, WorkspaceMemberSerializer, WorkspaceInviteSerializer
+from portal.workspace.models import (
+    Workspace, WorkspaceMember, WorkspaceInvite, Organization,
+    Task, TaskComment, TaskCommentFile, Chore, ChoreAssigned, Tombstone,
+)
+from portal.api.serializers import (
+    WorkspaceSerializer, WorkspaceMemberSerializer, WorkspaceInviteSerializer,
+    TaskDetailedSerializer, TaskCommentChangeSerializer, ChoreDetailedSerializer, ChoreAssignmentDetailedSerializer,
+)
+from portal.api.serializers.compiled import CompiledTaskDetailedSerializer, CompiledChoreAssignmentDetailedSerializer
 
 logger = logging.getLogger(__name__)
 
@@ -108,3 +119,101 @@ class AcceptInviteViewSet(APIView):
         except WorkspaceInvite.DoesNotExist:
             logger.error(f"Invalid invite token {token}")
             return Response({'error': 'Invalid invite'}, status=400)
+
+
+class WorkspaceChangesViewSet(APIView):
+    """
+    Delta sync: ``GET /api/workspaces/<id>/changes?since=<version>`` returns
+    the tasks, comments, chores and assignments created or updated since
+    `version`, serialized as by their detailed endpoints, plus the ids of
+    the deleted ones (``{'id', 'task'}`` for comments, whose task is re-sent
+    without their files). Without `since` every row is returned and nothing
+    is reported as deleted.
+
+    `version` is the server's clock at the request, in milliseconds since
+    epoch: the clock stamping ``updated_at``, not the Redis one behind ETags,
+    so the two can't be interchanged. Clients pass the returned `version` as
+    the next `since`. Changes are re-sent from
+    ``PORTAL_API['CHANGES_OVERLAP']`` before `since`, which also absorbs
+    clock skew between servers, so they must be applied idempotently.
+    Deletions are kept for ``PORTAL_API['TOMBSTONE_RETENTION']``; an older
+    `since` answers 410 and the client has to reload through the list
+    endpoints.
+
+    Categories and stages are embedded by key: renaming one doesn't re-send
+    the tasks and chores using it, clients refresh them from the categories
+    and stages endpoints. Responsible changes do re-send their chore.
+    """
+    def get(self, request, ws_id):
+        now = timezone.now()
+        since = request.query_params.get('since')
+        try:
+            since = int(since) if since else None
+        except ValueError:
+            return Response({'error': 'Invalid since'}, status=400)
+
+        since_at = None
+        if since:
+            try:
+                since_at = datetime.fromtimestamp(
+                    (since - settings.PORTAL_API.get('CHANGES_OVERLAP', 0)) / 1000, tz=dt_timezone.utc,
+                )
+            except (OverflowError, OSError, ValueError):
+                return Response({'error': 'Invalid since'}, status=400)
+            retention = timedelta(seconds=settings.PORTAL_API.get('TOMBSTONE_RETENTION', 30 * 86400))
+            if since_at < now - retention:
+                return Response({'error': 'Version too old, reload'}, status=410)
+
+        if not Workspace.objects.filter(id=ws_id).exists():
+            return Response({'error': 'Workspace not found'}, status=404)
+
+        tasks = Task.objects.filter(workspace_id=ws_id)
+        comments = TaskComment.objects.filter(task__workspace_id=ws_id)
+        chores = Chore.objects.filter(workspace_id=ws_id)
+        assignments = ChoreAssigned.objects.filter(workspace_id=ws_id)
+        deleted = {'tasks': [], 'comments': [], 'chores': [], 'assignments': []}
+
+        if since_at:
+            tombstones = Tombstone.objects.filter(workspace_id=ws_id, deleted_at__gte=since_at)
+            # Tasks embed their comment files, which never touch the task
+            # itself, whether added or deleted along with their comment
+            tasks = tasks.filter(
+                Q(updated_at__gte=since_at)
+                | Q(id__in=TaskCommentFile.objects.filter(
+                    task__workspace_id=ws_id, created_at__gte=since_at,
+                ).values('task_id'))
+                | Q(id__in=tombstones.filter(kind=Tombstone.KindChoices.COMMENT).values('parent_id'))
+            )
+            comments = comments.filter(updated_at__gte=since_at)
+            chores = chores.filter(updated_at__gte=since_at)
+            assignments = assignments.filter(updated_at__gte=since_at)
+
+            for kind, object_id, parent_id in tombstones.order_by('deleted_at').values_list('kind', 'object_id', 'parent_id'):
+                if kind == Tombstone.KindChoices.COMMENT:
+                    deleted['comments'].append({'id': str(object_id), 'task': str(parent_id)})
+                else:
+                    deleted[f'{kind}s'].append(str(object_id))
+
+        comment_files = TaskCommentFile.objects.select_related('file', 'owner')
+        tasks = tasks.select_related('owner', 'workspace').prefetch_related(
+            Prefetch('comment_files', queryset=comment_files),
+        )
+        comments = comments.select_related('author').prefetch_related(
+            Prefetch('files', queryset=comment_files),
+        )
+        chores = chores.select_related('workspace').prefetch_related('responsibles__user')
+        assignments = assignments.select_related('workspace', 'chore', 'user').prefetch_related('submissions')
+
+        compiled = settings.PORTAL_API.get('COMPILED_SERIALIZERS', False)
+        task_serializer = CompiledTaskDetailedSerializer if compiled else TaskDetailedSerializer
+        assignment_serializer = CompiledChoreAssignmentDetailedSerializer if compiled else ChoreAssignmentDetailedSerializer
+        context = {'request': request, 'view': self}
+
+        return Response({
+            'version': int(now.timestamp() * 1000),
+            'tasks': task_serializer(tasks.order_by('updated_at', 'id'), many=True, context=context).data,
+            'comments': TaskCommentChangeSerializer(comments.order_by('updated_at', 'id'), many=True, context=context).data,
+            'chores': ChoreDetailedSerializer(chores.order_by('updated_at', 'id'), many=True, context=context).data,
+            'assignments': assignment_serializer(assignments.order_by('updated_at', 'id'), many=True, context=context).data,
+            'deleted': deleted,
+        })
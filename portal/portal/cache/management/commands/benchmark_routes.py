@@ -0,0 +1,91 @@
+import random
+import re
+import time
+import uuid
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from portal.cache.routes import RouteMatcher
+
+SUFFIXES = ['', 'tasks/', 'tasks/{id}/', 'tasks/{id}/comments/', 'tasks/{id}/summary/',
+            'chores/', 'assignments/{id}/', 'categories/', 'stages/', 'changes', 'members/']
+
+
+def legacy_resolve(patterns, path):
+    """The per-pattern loop RouteMatcher replaced, kept as the baseline."""
+    for pattern in patterns:
+        optional_names = re.findall(r'<([^>]+)\?>', pattern)
+        regex = re.sub(r'/<([^>]+)\?>', r'(?:/(?P<\1>[^/]+))?', pattern)
+        regex = re.sub(r'/<([^/]+)>', r'/(?P<\1>[^/]+)', regex)
+        if regex.endswith('/*'):
+            regex = regex[:-2] + '(?:/.*)?'
+        match = re.match('^' + regex + '$', path)
+        if not match:
+            continue
+
+        segments = [segment for segment in pattern.split('/') if segment]
+
+        def build(skip=None):
+            values = []
+            for segment in segments:
+                if '<' not in segment:
+                    values.append(segment)
+                    continue
+                name = segment[1:-1]
+                if name == skip:
+                    continue
+                value = match.group(name.rstrip('?'))
+                if value:
+                    values.append(value)
+            key = '/' + '/'.join(values)
+            if (pattern.endswith('/') or pattern.endswith('/*')) and not key.endswith('/'):
+                key += '/'
+            return re.sub(r'/{2,}', '/', key)
+
+        keys = [build()]
+        for name in optional_names:
+            broader_key = build(skip=f'{name}?')
+            if broader_key not in keys:
+                keys.append(broader_key)
+        return keys
+    return []
+
+
+class Command(BaseCommand):
+    help = 'Compare the compiled route matcher with the per-pattern loop: output parity and timings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--paths', type=int, default=4000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        patterns = settings.PORTAL_CACHE.get('ROUTE_PATTERNS', [])
+        rng = random.Random(0)
+        paths = [
+            f"/api/workspaces/{uuid.UUID(int=rng.getrandbits(128))}/"
+            + rng.choice(SUFFIXES).format(id=uuid.UUID(int=rng.getrandbits(128)))
+            for _ in range(options['paths'])
+        ]
+
+        # Large enough to hold every path, so the warm pass only hits
+        matcher = RouteMatcher(patterns, cache_size=len(paths))
+        for path in paths:
+            if tuple(legacy_resolve(patterns, path)) != matcher.resolve(path):
+                raise CommandError(f"{path}: keys differ")
+
+        def per_path(resolve):
+            started = time.perf_counter()
+            for _ in range(options['repeat']):
+                for path in paths:
+                    resolve(path)
+            return (time.perf_counter() - started) / (options['repeat'] * len(paths))
+
+        timings = {
+            'loop': per_path(lambda path: legacy_resolve(patterns, path)),
+            'compiled': per_path(matcher._resolve),
+            'cached': per_path(matcher.resolve),
+        }
+        self.stdout.write(f"{len(paths)} paths, {len(patterns)} patterns: " + ', '.join(
+            f"{label} {timing * 1e6:.2f}us" for label, timing in timings.items()
+        ) + f" ({timings['loop'] / max(timings['compiled'], 1e-12):.1f}x uncached)")
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from portal.cache.redis_client import redis
+
+# Plain sets, without TTL, replaced by the resource-subscribers:* and
+# user-subscriptions:* sorted sets
+LEGACY_PATTERNS = ['resource-users:*', 'user-resources:*']
+
+
+class Command(BaseCommand):
+    help = 'Delete the subscription sets written before subscriptions expired (one-off)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        client = redis.client
+        for pattern in LEGACY_PATTERNS:
+            deleted = 0
+            batch = []
+            # SCAN rather than KEYS, so Redis is never blocked for long
+            for key in client.scan_iter(match=pattern, count=options['batch_size']):
+                batch.append(key)
+                if len(batch) >= options['batch_size']:
+                    deleted += self.delete(client, batch, options['dry_run'])
+                    batch = []
+            if batch:
+                deleted += self.delete(client, batch, options['dry_run'])
+            self.stdout.write(f"{pattern}: {'would delete' if options['dry_run'] else 'deleted'} {deleted} keys")
+
+    def delete(self, client, keys, dry_run):
+        if dry_run:
+            return len(keys)
+        return client.unlink(*keys)
@@ -1,31 +1,147 @@
-import json
-import redis
 from django.conf import settings
 
+from portal.utils.redis_pool import get_redis
+
+# Versions are Redis server time in milliseconds, forced to be strictly
+# greater than the last version handed out (hybrid logical clock). They are
+# therefore unique per write, never move backwards across app nodes with
+# skewed clocks, and stay comparable with wall-clock millisecond timestamps.
+NEXT_VERSION_LUA = """
+local function now_ms()
+    local now = redis.call('TIME')
+    return tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+end
+
+local function next_version(clock_key)
+    local version = now_ms()
+    local last = tonumber(redis.call('GET', clock_key) or '0')
+    if version <= last then
+        version = last + 1
+    end
+    redis.call('SET', clock_key, version)
+    return version
+end
+
+local function set_version(key, resource, version, ttl)
+    if ttl and ttl > 0 then
+        redis.call('SET', key, version, 'EX', ttl)
+    else
+        redis.call('SET', key, version)
+    end
+    redis.call('PUBLISH', 'resource-updates', cjson.encode({ key = resource, timestamp = version }))
+end
+"""
+
+# Bumps the timestamp of every given resource to one new version and
+# announces each of them, atomically and in a single round-trip.
+BUMP_RESOURCES_SCRIPT = NEXT_VERSION_LUA + """
+local version = next_version(KEYS[1])
+local ttl = tonumber(ARGV[1])
+for i = 2, #KEYS do
+    set_version(KEYS[i], ARGV[i], version, ttl)
+end
+return version
+"""
+
+# Reads the resource timestamp, creating (and announcing) it when missing,
+# subscribes the user to the resource, reads the version of the scope
+# resource cached bodies also depend on and, when a response cache key prefix
+# and suffix are given, fetches the cached body for both versions, all in a
+# single round-trip.
+#
+# Subscriptions are sorted sets scored by last access: entries older than the
+# subscription TTL are trimmed, each set keeps at most the newest N entries
+# and the sets themselves expire when nobody reads the resource any more.
+# The plain sets used before (resource-users:*, user-resources:*) never
+# expire: `manage.py purge_legacy_subscriptions` deletes them.
+TOUCH_RESOURCE_SCRIPT = NEXT_VERSION_LUA + """
+local timestamp = redis.call('GET', KEYS[2])
+-- Values written before versions were numeric (W/"<seconds>") are re-seeded
+if not timestamp or not tonumber(timestamp) then
+    timestamp = next_version(KEYS[1])
+    set_version(KEYS[2], ARGV[3], timestamp, tonumber(ARGV[1]))
+    timestamp = tostring(timestamp)
+end
+local accessed_at = now_ms()
+local subscription_ttl = tonumber(ARGV[6])
+local subscription_max = tonumber(ARGV[7])
+redis.call('ZADD', KEYS[3], accessed_at, ARGV[2])
+redis.call('ZADD', KEYS[4], accessed_at, ARGV[3])
+for i = 3, 4 do
+    redis.call('ZREMRANGEBYSCORE', KEYS[i], '-inf', '(' .. (accessed_at - subscription_ttl * 1000))
+    redis.call('ZREMRANGEBYRANK', KEYS[i], 0, -(subscription_max + 1))
+    redis.call('EXPIRE', KEYS[i], subscription_ttl)
+end
+local scope = ''
+if ARGV[8] ~= '' then
+    scope = redis.call('GET', ARGV[8]) or '0'
+end
+local cached = false
+if ARGV[4] ~= '' then
+    cached = redis.call('GET', ARGV[4] .. timestamp .. ':' .. scope .. ARGV[5])
+end
+return {timestamp, cached, scope}
+"""
+
 class RedisClient:
+    CLOCK_KEY = "resource-clock"
+
     def __init__(self):
+        self.subscription_ttl = settings.PORTAL_CACHE.get('SUBSCRIPTION_TTL', 7 * 86400)
+        self.subscription_max = settings.PORTAL_CACHE.get('SUBSCRIPTION_MAX', 500)
         config = settings.PORTAL_CACHE.get('REDIS', {})
-        self.client = redis.Redis(
-            host=config.get('HOST', 'localhost'),
-            port=config.get('PORT', 6379),
-            db=config.get('DB', 0),
-            decode_responses=True
-        )
+        url = f"redis://{config.get('HOST', 'localhost')}:{config.get('PORT', 6379)}/{config.get('DB', 0)}"
+        self.client = get_redis(url, decode_responses=True)
+        self.bump_resources_script = self.client.register_script(BUMP_RESOURCES_SCRIPT)
+        self.touch_resource_script = self.client.register_script(TOUCH_RESOURCE_SCRIPT)
 
     def get_timestamp(self, key):
         return self.client.get(f"resource-timestamps:{key}")
 
-    def set_timestamp(self, key, timestamp, ttl=None):
-        self.client.set(f"resource-timestamps:{key}", timestamp, ex=ttl)
-        self.client.publish(
-            "resource-updates",
-            json.dumps({ "key": key, "timestamp": timestamp }),
+    def get_timestamps(self, keys):
+        return self.client.mget([f"resource-timestamps:{key}" for key in keys])
+
+    def bump_timestamps(self, keys, ttl=None):
+        """
+        Move several resources to a new, strictly increasing version and
+        announce them, in one round-trip. Returns the new version.
+        """
+        return self.bump_resources_script(
+            keys=[self.CLOCK_KEY] + [f"resource-timestamps:{key}" for key in keys],
+            args=[ttl or 0] + list(keys),
         )
 
-    def delete_timestamp(self, key):
-        self.client.delete(f"resource-timestamps:{key}")
+    def touch_resource(self, key, user, ttl=None, cache_key_parts=None, scope_key=None):
+        """
+        Return the current timestamp of a resource, creating a new version if
+        it has none, and register `user` as a reader of it. Equivalent to
+        get_timestamp + bump_timestamps + subscribing in one round-trip.
 
-    def add_user_resource(self, key, user):
-        self.client.sadd(f"resource-users:{key}", user)
-        self.client.sadd(f"user-resources:{user}", key)
+        Returns a (timestamp, cached body, scope version) tuple. The scope
+        version is the timestamp of `scope_key` ('0' if it has none, '' without
+        `scope_key`); the body is only looked up when `cache_key_parts`
+        (prefix, suffix) is given, under ``prefix + timestamp + ':' + scope
+        version + suffix``.
+        """
+        prefix, suffix = cache_key_parts or ('', '')
+        current, cached, scope = self.touch_resource_script(
+            keys=[
+                self.CLOCK_KEY,
+                f"resource-timestamps:{key}",
+                f"resource-subscribers:{key}",
+                f"user-subscriptions:{user}",
+            ],
+            args=[
+                ttl or 0,
+                user,
+                key,
+                prefix,
+                suffix,
+                self.subscription_ttl,
+                self.subscription_max,
+                f"resource-timestamps:{scope_key}" if scope_key else '',
+            ],
+        )
+        return current, cached, scope
 
+redis = RedisClient()
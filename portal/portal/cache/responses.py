@@ -0,0 +1,124 @@
+import hashlib
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from django.http.response import HttpResponse
+
+from .redis_client import redis
+
+WORKSPACE_KEY_REGEX = re.compile(r'^/api/workspaces/([^/*]+)/')
+# Bumped by the WorkspaceMember signals, see PORTAL_CACHE_SIGNALS
+MEMBERS_KEY = '/api/workspaces/{workspace_id}/members/*/'
+
+
+class ResponseCache(ABC):
+    """
+    Stores rendered GET bodies per (resource key, resource timestamp, user,
+    full path). Entries are never invalidated explicitly: any write bumps the
+    resource timestamp, so stale bodies simply stop being looked up and age out
+    through their TTL (or LRU eviction for the local backend).
+
+    Bodies are scoped per user because RLS filters rows per user, and keyed
+    by the version of the workspace membership too: membership routes match
+    no resource key, so removing a member bumps nothing the entry depends on
+    otherwise, and the removed user would keep getting cached bodies.
+    """
+    # Whether the lookup is folded into RedisClient.touch_resource
+    inline = False
+
+    def __init__(self, ttl=300, max_size=1024 * 1024, **kwargs):
+        self.ttl = ttl
+        self.max_size = max_size
+
+    def key_parts(self, resource_key, request):
+        """Key prefix and suffix around the resource timestamp."""
+        path_hash = hashlib.sha1(request.get_full_path().encode()).hexdigest()
+        return f"response-cache:{resource_key}:", f":{request.user.id}:{path_hash}"
+
+    def scope_key(self, resource_key):
+        """Membership resource of the workspace `resource_key` belongs to, if any."""
+        match = WORKSPACE_KEY_REGEX.match(resource_key)
+        return MEMBERS_KEY.format(workspace_id=match.group(1)) if match else None
+
+    @abstractmethod
+    def get(self, key):
+        """Cached value of `key`, or None."""
+
+    @abstractmethod
+    def set(self, key, value):
+        """Store `value` under `key` for `ttl` seconds."""
+
+    def store(self, key, response):
+        """Cache `response` under `key` if it is a complete JSON 200."""
+        if response.status_code != 200 or response.streaming or response.has_header('Set-Cookie'):
+            return
+        content_type = response.get('Content-Type', '')
+        if not content_type.startswith('application/json'):
+            return
+        content = response.content
+        if len(content) > self.max_size:
+            return
+        self.set(key, f"{content_type}\n{content.decode()}")
+
+    def build_response(self, value):
+        content_type, body = value.split('\n', 1)
+        return HttpResponse(body, content_type=content_type)
+
+
+class RedisResponseCache(ResponseCache):
+    inline = True
+
+    def get(self, key):
+        return redis.client.get(key)
+
+    def set(self, key, value):
+        redis.client.set(key, value, ex=self.ttl)
+
+
+class LocalResponseCache(ResponseCache):
+    """Per-process LRU; cheaper than Redis but not shared between workers."""
+
+    def __init__(self, max_entries=512, **kwargs):
+        super().__init__(**kwargs)
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+
+BACKENDS = {
+    'redis': RedisResponseCache,
+    'local': LocalResponseCache,
+}
+
+
+def get_response_cache(config):
+    """Build the configured response cache, or None when disabled."""
+    if not config or not config.get('ENABLED', False):
+        return None
+    return BACKENDS[config.get('BACKEND', 'redis')](
+        ttl=config.get('TTL', 300),
+        max_size=config.get('MAX_SIZE', 1024 * 1024),
+        max_entries=config.get('MAX_ENTRIES', 512),
+    )
@@ -0,0 +1,163 @@
+import re
+from functools import lru_cache
+
+
+class RoutePattern:
+    """
+    A single ``PORTAL_CACHE['ROUTE_PATTERNS']`` entry, parsed once.
+
+    Patterns use ``<name>`` for required parameters, ``<name?>`` for optional
+    ones and a trailing ``/*`` to match anything below the route. Keys keep the
+    literal segments of the pattern (including ``*``) and substitute the
+    matched parameter values, e.g. ``/api/workspaces/<id>/tasks/<task_id?>/*``
+    matching ``/api/workspaces/1/tasks/2/`` yields ``/api/workspaces/1/tasks/2/*/``
+    plus the broader ``/api/workspaces/1/tasks/*/``.
+    """
+
+    def __init__(self, pattern, index):
+        self.pattern = pattern
+        self.name = f'_{index}'
+        self.trailing_slash = pattern.endswith('/') or pattern.endswith('/*')
+
+        self.segments = []  # (is_param, literal or group name)
+        self.optional = []  # group names of optional params
+        self.groups = {}  # param name -> group name
+
+        regex = ''
+        parts = pattern.split('/')
+        for position, segment in enumerate(parts[1:], start=1):
+            if segment == '*' and position == len(parts) - 1:
+                regex += '(?:/.*)?'
+                self.segments.append((False, segment))
+            elif segment.startswith('<') and segment.endswith('>'):
+                param = segment[1:-1]
+                optional = param.endswith('?')
+                group = f'r{index}_{param.rstrip("?")}'
+                self.groups[param.rstrip('?')] = group
+                if optional:
+                    self.optional.append(group)
+                    regex += f'(?:/(?P<{group}>[^/]+))?'
+                else:
+                    regex += f'/(?P<{group}>[^/]+)'
+                self.segments.append((True, group))
+            else:
+                regex += '/' + re.escape(segment)
+                if segment:
+                    self.segments.append((False, segment))
+
+        self.regex = regex
+
+    def keys(self, match):
+        """
+        Build the primary key and, for each optional parameter, the broader
+        key without it. The primary key always comes first.
+        """
+        keys = [self._build(match)]
+        for group in self.optional:
+            broader_key = self._build(match, skip=group)
+            if broader_key not in keys:
+                keys.append(broader_key)
+        return tuple(keys)
+
+    def _build(self, match, skip=None):
+        values = []
+        for is_param, value in self.segments:
+            if not is_param:
+                values.append(value)
+            elif value != skip:
+                param_value = match.group(value)
+                if param_value:
+                    values.append(param_value)
+        key = '/' + '/'.join(values)
+        if self.trailing_slash and not key.endswith('/'):
+            key += '/'
+        return key
+
+
+class RouteMatcher:
+    """
+    Resolves request paths to resource keys using every configured route
+    pattern compiled into a single alternation regex. Patterns keep their
+    configured priority: the first one that matches wins.
+
+    Resolved paths are memoized in a bounded LRU, so repeated requests for the
+    same path skip matching altogether.
+    """
+
+    def __init__(self, patterns, cache_size=1024):
+        self.routes = [RoutePattern(pattern, index) for index, pattern in enumerate(patterns)]
+        self.by_name = {route.name: route for route in self.routes}
+        self.regex = re.compile(
+            '^(?:' + '|'.join(f'(?P<{route.name}>{route.regex})' for route in self.routes) + ')$'
+        ) if self.routes else None
+        self.resolve = lru_cache(maxsize=cache_size)(self._resolve)
+
+    def _resolve(self, path):
+        if self.regex is None:
+            return ()
+        match = self.regex.match(path)
+        if not match:
+            return ()
+        # The enclosing alternative is the last group to close, so it is
+        # always reported as ``lastgroup``.
+        return self.by_name[match.lastgroup].keys(match)
+
+
+class KeyTemplate:
+    """
+    A resource key with ``<name>`` placeholders, e.g.
+    ``/api/workspaces/<ws_id>/tasks/<task_id>/*/``. Can parse concrete keys
+    and be filled in with parameters.
+    """
+
+    def __init__(self, template):
+        self.template = template
+        self.parts = re.split(r'<([^>]+)>', template)  # literal, name, literal, ...
+        self.regex = re.compile('^' + ''.join(
+            f'(?P<{part}>[^/]+)' if index % 2 else re.escape(part)
+            for index, part in enumerate(self.parts)
+        ) + '$')
+
+    def match(self, key):
+        match = self.regex.match(key)
+        return match.groupdict() if match else None
+
+    def format(self, **params):
+        return ''.join(
+            str(params[part]) if index % 2 else part
+            for index, part in enumerate(self.parts)
+        )
+
+
+class DependencyGraph:
+    """
+    Declarative invalidation fan-out from ``PORTAL_CACHE['DEPENDENCIES']``:
+    each key template maps to the templates of the resources that embed it.
+    Expanding a set of keys walks the graph transitively, so bumping a
+    comment also bumps its task, the task list and so on, in a single write.
+    """
+
+    def __init__(self, dependencies, cache_size=1024):
+        self.edges = [
+            (KeyTemplate(source), [KeyTemplate(target) for target in targets])
+            for source, targets in dependencies.items()
+        ]
+        self.expand = lru_cache(maxsize=cache_size)(self._expand)
+
+    def _expand(self, keys):
+        expanded = list(dict.fromkeys(keys))
+        seen = set(expanded)
+        index = 0
+        while index < len(expanded):
+            key = expanded[index]
+            index += 1
+            for source, targets in self.edges:
+                params = source.match(key)
+                if params is None:
+                    continue
+                for target in targets:
+                    dependent = target.format(**params)
+                    if dependent not in seen:
+                        seen.add(dependent)
+                        expanded.append(dependent)
+        return tuple(expanded)
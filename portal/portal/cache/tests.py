@@ -0,0 +1,136 @@
+from unittest import mock
+
+import fakeredis
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from portal.auth.models import User
+from portal.cache import redis_client
+from portal.cache.responses import RedisResponseCache
+from portal.cache.versioning import ResourceVersioner
+from portal.workspace.models import Organization, Task, Workspace, WorkspaceMember
+
+
+class FakeRedisMixin:
+    """Points the shared RedisClient (and its Lua scripts) at fakeredis."""
+
+    def setUp(self):
+        super().setUp()
+        client = fakeredis.FakeRedis(decode_responses=True)
+        for name, value in {
+            'client': client,
+            'bump_resources_script': client.register_script(redis_client.BUMP_RESOURCES_SCRIPT),
+            'touch_resource_script': client.register_script(redis_client.TOUCH_RESOURCE_SCRIPT),
+        }.items():
+            patcher = mock.patch.object(redis_client.redis, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+class ResourceVersionerTests(FakeRedisMixin, SimpleTestCase):
+    TASK = '/api/workspaces/w1/tasks/t1/*/'
+    COMMENTS = '/api/workspaces/w1/tasks/t1/comments/*/'
+
+    def setUp(self):
+        super().setUp()
+        self.versioner = ResourceVersioner(ttl=0, dependencies={
+            '/api/workspaces/<ws_id>/tasks/<task_id>/comments/*/': ['/api/workspaces/<ws_id>/tasks/<task_id>/*/'],
+            '/api/workspaces/<ws_id>/tasks/<task_id>/*/': ['/api/workspaces/<ws_id>/tasks/*/'],
+        })
+
+    def test_bump_expands_dependencies(self):
+        version = self.versioner.bump([self.COMMENTS])
+        self.assertEqual(
+            self.versioner.get_many([self.COMMENTS, self.TASK, '/api/workspaces/w1/tasks/*/']),
+            [version] * 3,
+        )
+        # Siblings are untouched
+        self.assertIsNone(self.versioner.get('/api/workspaces/w1/tasks/t2/*/'))
+
+    def test_bump_is_strictly_increasing(self):
+        first = self.versioner.bump([self.TASK])
+        second = self.versioner.bump([self.TASK])
+        self.assertGreater(second, first)
+        self.assertEqual(self.versioner.get(self.TASK), second)
+
+    def test_bump_without_keys(self):
+        self.assertIsNone(self.versioner.bump([]))
+
+    def test_get_many_reports_missing_keys(self):
+        version = self.versioner.bump([self.TASK])
+        self.assertEqual(self.versioner.get_many(['/missing/', self.TASK]), [None, version])
+
+    def test_touch_creates_version_once(self):
+        version, cached, scope = self.versioner.touch(self.TASK, 1)
+        self.assertEqual(self.versioner.get(self.TASK), version)
+        self.assertIsNone(cached)
+        self.assertEqual(scope, '')
+        self.assertEqual(self.versioner.touch(self.TASK, 2)[0], version)
+        subscribers = redis_client.redis.client.zrange(f'resource-subscribers:{self.TASK}', 0, -1)
+        self.assertEqual(sorted(subscribers), ['1', '2'])
+
+    def test_touch_reads_cached_body_and_scope(self):
+        version = self.versioner.bump([self.TASK])
+        scope_version = self.versioner.bump(['/api/workspaces/w1/members/*/'])
+        redis_client.redis.client.set(f'body:{version}:{scope_version}:1', 'cached')
+        self.assertEqual(
+            self.versioner.touch(self.TASK, 1, cache_key_parts=('body:', ':1'), scope_key='/api/workspaces/w1/members/*/'),
+            (version, 'cached', str(scope_version)),
+        )
+        # Scope resources without a version yet read as '0'
+        self.assertEqual(self.versioner.touch(self.TASK, 1, scope_key='/api/workspaces/w2/members/*/')[2], '0')
+
+    def test_legacy_etag_values_read_as_missing(self):
+        redis_client.redis.client.set(f'resource-timestamps:{self.TASK}', 'W/"1760000000"')
+        self.assertIsNone(self.versioner.get(self.TASK))
+        self.assertEqual(self.versioner.get_many([self.TASK]), [None])
+
+        # Re-seeded on the next read
+        version, _, _ = self.versioner.touch(self.TASK, 1)
+        self.assertGreater(version, 1760000000)
+        self.assertEqual(self.versioner.get(self.TASK), version)
+
+    def test_etag_round_trip(self):
+        version = self.versioner.bump([self.TASK])
+        etag = ResourceVersioner.format_etag(version)
+        self.assertEqual(etag, f'W/"{version}"')
+        self.assertEqual(ResourceVersioner.parse_etag(etag), version)
+
+    def test_parse_etag_malformed(self):
+        for etag in (None, '', 'W/"abc"', '"123"', 'W/123', '*'):
+            with self.subTest(etag=etag):
+                self.assertEqual(ResourceVersioner.parse_etag(etag), 0)
+
+
+@override_settings(PORTAL_CACHE={
+    **settings.PORTAL_CACHE,
+    'RESPONSE_CACHE': {**settings.PORTAL_CACHE['RESPONSE_CACHE'], 'ENABLED': True, 'BACKEND': 'redis'},
+})
+class ResponseCacheTests(FakeRedisMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.owner = User.objects.create(username='owner')
+        self.member = User.objects.create(username='member')
+        organization = Organization.objects.create(name='Organization')
+        self.workspace = Workspace.objects.create(label='Workspace', organization=organization)
+        WorkspaceMember.objects.create(workspace=self.workspace, user=self.owner, role='owner')
+        self.membership = WorkspaceMember.objects.create(workspace=self.workspace, user=self.member, role='user')
+        Task.objects.create(title='Task', description='', workspace=self.workspace, owner=self.owner)
+        self.tasks_url = f'/api/workspaces/{self.workspace.id}/tasks/'
+
+    def test_removed_member_is_not_served_cached_body(self):
+        self.client.force_login(self.member)
+        with mock.patch.object(RedisResponseCache, 'build_response', autospec=True,
+                               side_effect=RedisResponseCache.build_response) as build_response:
+            self.assertEqual(self.client.get(self.tasks_url).status_code, 200)
+            self.assertEqual(self.client.get(self.tasks_url).status_code, 200)
+            self.assertEqual(build_response.call_count, 1)
+
+            self.client.force_login(self.owner)
+            response = self.client.delete(f'/api/workspaces/{self.workspace.id}/members/{self.membership.id}/')
+            self.assertEqual(response.status_code, 204)
+
+            # Same tasks version, but the membership moved on
+            self.client.force_login(self.member)
+            self.client.get(self.tasks_url)
+            self.assertEqual(build_response.call_count, 1)
@@ -0,0 +1,75 @@
+import re
+from django.conf import settings
+
+from .redis_client import redis
+from .routes import DependencyGraph
+
+ETAG_REGEX = re.compile(r'W/"([0-9]+)"')
+
+
+def _parse_version(value):
+    # Older releases stored the ETag itself (W/"<seconds>"): read as missing
+    return int(value) if value and value.isdigit() else None
+
+
+class ResourceVersioner:
+    """
+    Single entry point to bump, read and format resource versions. The
+    middleware, model signals and background tasks all go through it, so a
+    version written by any of them yields the same ETag and the same
+    `resource-updates` payload.
+    """
+
+    def __init__(self, client=None, ttl=None, dependencies=None):
+        self.client = client or redis
+        self.ttl = ttl if ttl is not None else settings.PORTAL_CACHE.get('TIMESTAMP_TTL', None)
+        self.graph = DependencyGraph(
+            dependencies if dependencies is not None else settings.PORTAL_CACHE.get('DEPENDENCIES', {}),
+            cache_size=settings.PORTAL_CACHE.get('ROUTE_CACHE_SIZE', 1024),
+        )
+
+    def bump(self, keys, ttl=None):
+        """
+        Move `keys`, and every resource depending on them, to one new version
+        and announce them, atomically. Returns the version.
+        """
+        if not keys:
+            return None
+        keys = self.graph.expand(tuple(keys))
+        return int(self.client.bump_timestamps(list(keys), ttl=ttl or self.ttl))
+
+    def get(self, key):
+        """Current version of `key`, or None if it has none yet."""
+        return _parse_version(self.client.get_timestamp(key))
+
+    def get_many(self, keys):
+        """Current versions of `keys` in one round-trip, None where missing."""
+        return [_parse_version(version) for version in self.client.get_timestamps(keys)]
+
+    def touch(self, key, user, cache_key_parts=None, scope_key=None):
+        """
+        Current version of `key` (created if missing), registering `user` as a
+        reader. Returns a (version, cached body, scope version) tuple, see
+        RedisClient.touch_resource.
+        """
+        version, cached, scope = self.client.touch_resource(
+            key, user, ttl=self.ttl, cache_key_parts=cache_key_parts, scope_key=scope_key,
+        )
+        return int(version), cached, scope
+
+    @staticmethod
+    def format_etag(version):
+        return f'W/"{version}"'
+
+    @staticmethod
+    def parse_etag(etag=None):
+        """Version carried by an ETag, or 0 if it is missing or malformed."""
+        if not etag:
+            return 0
+        match = ETAG_REGEX.search(etag)
+        if match:
+            return int(match.group(1))
+        return 0
+
+
+versioner = ResourceVersioner()
@@ -5,7 +5,7 @@ from rq.cron import CronScheduler
 django.setup()
 
 from portal.cron.redis_client import redis
-from portal.cron.tasks.workspace import schedule_chores_jobs
+from portal.cron.tasks.workspace import purge_tombstones, schedule_chores_jobs
 
 class Command(BaseCommand):
     help = 'Run RQ scheduler for workspace'
@@ -18,6 +18,11 @@ class Command(BaseCommand):
             interval=60,
             meta={ "job_id": "foobar" },
         )
+        cron.register(
+            purge_tombstones,
+            queue_name='workspace-scheduler',
+            interval=3600,
+        )
         try:
             print("Starting cron scheduler...")
             cron.start()
@@ -1,12 +1,7 @@
-from django.conf import settings
-from redis import Redis
+from portal.utils.redis_pool import RQRedisClient
 
-class RedisClient:
+class RedisClient(RQRedisClient):
     def __init__(self):
-        self.client = Redis.from_url(settings.PORTAL_CRON_RQ_REDIS_URL)
-
-    def get_con(self):
-        return self.client
+        super().__init__('PORTAL_CRON_RQ_REDIS_URL')
 
 redis = RedisClient()
-
@@ -1,12 +1,14 @@
 from croniter import croniter
-from datetime import datetime
+from datetime import datetime, timedelta
+from django.conf import settings
+from django.utils import timezone
 from rq import Queue
 
-from portal.workspace.models import Workspace, Chore, ChoreResponsible, ChoreAssigned
+from portal.workspace.models import Workspace, Chore, ChoreResponsible, ChoreAssigned, Tombstone
 from portal.cron.redis_client import redis
 
 def schedule_chores_jobs():
-    queue = Queue(name='workspace-chore', connection=redis.get_con())
+    queue = redis.get_queue('workspace-chore')
     jobs = []
     for workspace in Workspace.objects.all():
         job_id = f"schedule-chores-jobs.{workspace.id}"
@@ -20,7 +22,7 @@ def schedule_chores_jobs():
     queue.enqueue_many(jobs)
 
 def manage_assignments_schedules(workspace_id):
-    queue = Queue(name='workspace-assigned', connection=redis.get_con())
+    queue = redis.get_queue('workspace-assigned')
     for chore in Chore.objects.all().filter(workspace_id=workspace_id):
         for responsible in ChoreResponsible.objects.all().filter(chore_id=chore.id):
             try:
@@ -42,3 +44,7 @@ def manage_assignments_schedules(workspace_id):
 def create_assignment(workspace_id, chore_id, user_id):
     assignment = ChoreAssigned(workspace_id=workspace_id, chore_id=chore_id, user_id=user_id)
     assignment.save()
+
+def purge_tombstones():
+    retention = timedelta(seconds=settings.PORTAL_API.get('TOMBSTONE_RETENTION', 30 * 86400))
+    Tombstone.objects.filter(deleted_at__lt=timezone.now() - retention).delete()
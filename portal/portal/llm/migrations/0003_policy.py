@@ -0,0 +1,56 @@
+from django.db import migrations
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('llm', '0002_policy'),
+        ('workspace', '0007_policy'),
+    ]
+
+    operations = [
+        # TaskSummary policies
+        migrations.RunSQL(
+            sql="""DROP POLICY IF EXISTS tasksummary_select ON llm_tasksummary;
+            CREATE POLICY tasksummary_select ON llm_tasksummary
+            FOR SELECT
+            USING (
+                task_id IN (
+                    SELECT id
+                    FROM workspace_task
+                    WHERE workspace_id = ANY ((SELECT workspace_member_workspaces()))
+                )
+            );
+            DROP POLICY IF EXISTS tasksummary_delete ON llm_tasksummary;
+            CREATE POLICY tasksummary_delete ON llm_tasksummary
+            FOR DELETE
+            USING (
+                task_id IN (
+                    SELECT id
+                    FROM workspace_task
+                    WHERE workspace_id = ANY ((SELECT workspace_member_workspaces()))
+                )
+            );
+            """,
+            reverse_sql="""DROP POLICY IF EXISTS tasksummary_select ON llm_tasksummary;
+            CREATE POLICY tasksummary_select ON llm_tasksummary
+            FOR SELECT
+            USING (
+                task_id IN (
+                    SELECT id
+                    FROM workspace_task
+                    WHERE workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) != ''
+                )
+            );
+            DROP POLICY IF EXISTS tasksummary_delete ON llm_tasksummary;
+            CREATE POLICY tasksummary_delete ON llm_tasksummary
+            FOR DELETE
+            USING (
+                task_id IN (
+                    SELECT id
+                    FROM workspace_task
+                    WHERE workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) != ''
+                )
+            );
+            """
+        ),
+    ]
@@ -1,3 +1,4 @@
+from django.db import transaction
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from rq import Queue
@@ -6,10 +7,20 @@ from portal.llm.redis_client import redis
 
 @receiver(post_save, sender='workspace.Task')
 def queue_task_summary(sender, instance, **kwargs):
-    queue = Queue('llm', connection=redis.get_con())
-    queue.enqueue('portal.llm.tasks.generate_workspace_task_summary', str(instance.id))
+    # After commit, so the worker reads the saved rows
+    transaction.on_commit(lambda: queue_task_summaries([instance.id]))
 
 @receiver(post_save, sender='workspace.TaskComment')
 def queue_task_comment_summary(sender, instance, **kwargs):
-    queue = Queue('llm', connection=redis.get_con())
-    queue.enqueue('portal.llm.tasks.generate_workspace_task_summary', str(instance.task_id))
+    transaction.on_commit(lambda: queue_task_summaries([instance.task_id]))
+
+def queue_task_summaries(task_ids):
+    """
+    Queue the summaries of `task_ids` in one round-trip; bulk writes, which
+    skip post_save, call it directly.
+    """
+    queue = redis.get_queue('llm')
+    queue.enqueue_many([
+        Queue.prepare_data('portal.llm.tasks.generate_workspace_task_summary', (str(task_id),))
+        for task_id in dict.fromkeys(task_ids)
+    ])
@@ -282,7 +282,12 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ),
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'portal.api.renderers.ORJSONRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'portal.api.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
 }
 
@@ -294,9 +299,62 @@ MINIO_ENDPOINT = environ.get('MINIO_ENDPOINT', 'http://localhost:9000')
 MINIO_ACCESS_KEY = environ.get('MINIO_ACCESS_KEY', 'minioadmin')
 MINIO_SECRET_KEY = environ.get('MINIO_SECRET_KEY', 'miniosecret')
 MINIO_SECURE = environ.get('MINIO_SECURE', 'False').lower() == 'true'
+MINIO_CLIENT = {
+    # One client per process and endpoint, shared by all threads
+    'MAX_POOL_CONNECTIONS': int(environ.get('MINIO_CLIENT__MAX_POOL_CONNECTIONS', 50)),
+    'CONNECT_TIMEOUT': int(environ.get('MINIO_CLIENT__CONNECT_TIMEOUT', 5)),  # Seconds
+    'READ_TIMEOUT': int(environ.get('MINIO_CLIENT__READ_TIMEOUT', 60)),  # Seconds
+    'TCP_KEEPALIVE': environ.get('MINIO_CLIENT__TCP_KEEPALIVE', 'true').lower() == 'true',
+    'MAX_ATTEMPTS': int(environ.get('MINIO_CLIENT__MAX_ATTEMPTS', 3)),  # Including the first one
+    'WARMUP': environ.get('MINIO_CLIENT__WARMUP', 'true').lower() == 'true',  # Create clients on startup
+}
+MINIO_UPLOAD = {
+    'MAX_SIZE': int(environ.get('MINIO_UPLOAD__MAX_SIZE', 100 * 1024 * 1024)),  # Bytes, larger files are dropped while parsing
+    'PART_SIZE': int(environ.get('MINIO_UPLOAD__PART_SIZE', 8 * 1024 * 1024)),  # Bytes, multipart upload above one part
+    'CONCURRENCY': int(environ.get('MINIO_UPLOAD__CONCURRENCY', 4)),  # Parts sent in parallel
+}
+MINIO_DOWNLOAD = {
+    # 'proxy' streams files through the app, 'redirect' sends clients to a presigned MinIO URL
+    'MODE': environ.get('MINIO_DOWNLOAD__MODE', 'proxy'),
+    'URL_TTL': int(environ.get('MINIO_DOWNLOAD__URL_TTL', 300)),  # Seconds a presigned URL is valid
+    'PUBLIC_ENDPOINT': environ.get('MINIO_DOWNLOAD__PUBLIC_ENDPOINT', None),  # MinIO as reached by clients, defaults to MINIO_ENDPOINT
+}
+MINIO_DERIVATIVES = {
+    # Image attachments are also stored resized to fit these boxes (pixels), as WebP
+    'SIZES': {
+        'small': 256,
+        'medium': 1024,
+    },
+    'QUALITY': 80,
+}
+
+# Uploads are spooled to a temporary file above FILE_UPLOAD_MAX_MEMORY_SIZE
+FILE_UPLOAD_MAX_MEMORY_SIZE = int(environ.get('FILE_UPLOAD_MAX_MEMORY_SIZE', 2621440))  # 2.5 MiB
+FILE_UPLOAD_HANDLERS = [
+    'portal.storage.uploadhandlers.MaxSizeUploadHandler',
+    'portal.storage.uploadhandlers.HashingUploadHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
 
 # APPS CONFIGS
 
+PORTAL_API = {
+    # Serve detailed list/retrieve endpoints with portal.api.serializers.compiled
+    'COMPILED_SERIALIZERS': environ.get('PORTAL_API__COMPILED_SERIALIZERS', 'false').lower() == 'true',
+    # Changes endpoint: deletions are only known for this long, older `since` need a full reload
+    'TOMBSTONE_RETENTION': int(environ.get('PORTAL_API__TOMBSTONE_RETENTION', 30 * 86400)),  # Seconds
+    # Changes endpoint: re-sent window before `since`, covers clock skew and in-flight transactions
+    'CHANGES_OVERLAP': 5000,  # Milliseconds
+    'BULK_MAX_ITEMS': 500,  # Per bulk write request
+}
+
+PORTAL_REDIS_POOL = {
+    'MAX_CONNECTIONS': int(environ.get('PORTAL_REDIS_POOL__MAX_CONNECTIONS', 50)),  # Per pool, per process
+    'TIMEOUT': int(environ.get('PORTAL_REDIS_POOL__TIMEOUT', 20)),  # Seconds to wait for a free connection
+    'HEALTH_CHECK_INTERVAL': int(environ.get('PORTAL_REDIS_POOL__HEALTH_CHECK_INTERVAL', 30)),
+}
+
 PORTAL_CACHE = {
     'REDIS': {
         'HOST': environ.get('PORTAL_CACHE__REDIS__HOST', 'localhost'),
@@ -313,21 +371,91 @@ PORTAL_CACHE = {
         '/api/workspaces/<id>/stages/*',
         '/api/workspaces/<id>/*',
     ],
+    # Resources embedding others: bumping a key also bumps its dependents, transitively
+    'DEPENDENCIES': {
+        '/api/workspaces/<ws_id>/tasks/<task_id>/comments/*/': [
+            '/api/workspaces/<ws_id>/tasks/<task_id>/*/',
+        ],
+        '/api/workspaces/<ws_id>/tasks/<task_id>/*/': [
+            '/api/workspaces/<ws_id>/tasks/*/',
+            '/api/workspaces/<ws_id>/tasks/<task_id>/summary/*/',
+        ],
+        '/api/workspaces/<ws_id>/tasks/*/': [
+            '/api/workspaces/<ws_id>/*/',
+        ],
+        '/api/workspaces/<ws_id>/chores/*/': [
+            '/api/workspaces/<ws_id>/assignments/*/',
+        ],
+        # The workspace version covers everything the changes endpoint reports
+        '/api/workspaces/<ws_id>/assignments/*/': [
+            '/api/workspaces/<ws_id>/*/',
+        ],
+        # Tasks and chores embed their category/stage
+        '/api/workspaces/<ws_id>/categories/*/': [
+            '/api/workspaces/<ws_id>/tasks/*/',
+            '/api/workspaces/<ws_id>/chores/*/',
+        ],
+        '/api/workspaces/<ws_id>/stages/*/': [
+            '/api/workspaces/<ws_id>/tasks/*/',
+        ],
+    },
     'HEADER_NAME': 'ETag',
     'TIMESTAMP_TTL': 86400,  # 24 hours (optional)
+    'SUBSCRIPTION_TTL': 7 * 86400,  # Forget user <-> resource subscriptions unused for a week
+    'SUBSCRIPTION_MAX': 500,  # Newest subscriptions kept per user and per resource
+    'ROUTE_CACHE_SIZE': 1024,  # Resolved path -> keys LRU entries
+    'TAXONOMY_TTL': 3600,  # Seconds a workspace category/stage map stays in Redis
+    # Opt-in server-side cache of rendered GET bodies, keyed on resource timestamps
+    'RESPONSE_CACHE': {
+        'ENABLED': environ.get('PORTAL_CACHE__RESPONSE_CACHE__ENABLED', 'false').lower() == 'true',
+        'BACKEND': environ.get('PORTAL_CACHE__RESPONSE_CACHE__BACKEND', 'redis'),  # 'redis' or 'local'
+        'TTL': 300,  # Seconds
+        'MAX_SIZE': 1024 * 1024,  # Bytes, larger bodies are not cached
+        'MAX_ENTRIES': 512,  # 'local' backend only
+    },
 }
 
 PORTAL_CACHE_SIGNALS = [
+    {
+        'app': 'workspace',
+        'model': 'Category',
+        'resource': '/api/workspaces/{workspace_id}/categories/*/',
+        'keys': ['workspace_id'],
+        'delete': True,  # Also bump on post_delete
+    },
+    {
+        'app': 'workspace',
+        'model': 'Stage',
+        'resource': '/api/workspaces/{workspace_id}/stages/*/',
+        'keys': ['workspace_id'],
+        'delete': True,
+    },
     {
         'app': 'workspace',
         'model': 'ChoreAssigned',
         'resource': '/api/workspaces/{workspace_id}/assignments/*/',
         'keys': ['workspace_id'],
-    }
+    },
+    {
+        # Scopes cached response bodies, see portal.cache.responses
+        'app': 'workspace',
+        'model': 'WorkspaceMember',
+        'resource': '/api/workspaces/{workspace_id}/members/*/',
+        'keys': ['workspace_id'],
+        'delete': True,
+    },
+    {
+        'app': 'llm',
+        'model': 'TaskSummary',
+        'resource': '/api/workspaces/{task.workspace_id}/tasks/{task_id}/summary/*/',
+        'keys': ['task', 'task_id'],
+    },
 ]
 
 PORTAL_CRON_RQ_REDIS_URL = environ.get('PORTAL_CRON_RQ_REDIS_URL', 'redis://localhost:6379/1')
 
 PORTAL_LLM_RQ_REDIS_URL = environ.get('PORTAL_LLM_RQ_REDIS_URL', 'redis://localhost:6379/2')
+
+PORTAL_STORAGE_RQ_REDIS_URL = environ.get('PORTAL_STORAGE_RQ_REDIS_URL', 'redis://localhost:6379/3')
 PORTAL_LLM_URL = environ.get('PORTAL_LLM_URL', 'http://localhost:8085')
 
@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class StorageConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'portal.storage'
+
+    def ready(self):
+        import portal.storage.signals
+
+        from django.conf import settings
+        if settings.MINIO_CLIENT['WARMUP']:
+            from portal.storage.minio_client import warmup
+            warmup()
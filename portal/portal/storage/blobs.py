@@ -0,0 +1,84 @@
+"""
+Content-addressed storage of workspace files.
+
+Objects are keyed by the SHA-256 of their content within a workspace, so
+uploading the same file again only adds a WorkspaceFile row pointing at the
+existing object. The rows are the references: an object, and its resized
+copies, is deleted once the last row using its key is.
+
+Storing and releasing a key take the same Postgres advisory lock, so an
+upload can't reuse an object that is being deleted.
+"""
+import logging
+
+from botocore.exceptions import ClientError
+from django.conf import settings
+from django.db import connection, transaction
+
+from portal.storage.minio_client import get_minio_client, upload_fileobj
+from portal.storage.models import WorkspaceFile
+
+logger = logging.getLogger(__name__)
+
+BUCKET = 'workspace-task-files'
+
+
+def content_key(workspace_id, content_hash):
+    return f"workspaces/{workspace_id}/sha256/{content_hash}"
+
+
+def derivative_key(file_key, size):
+    return f"{file_key}.{size}.webp"
+
+
+def lock_key(file_key):
+    """Hold a lock on `file_key` until the current transaction ends."""
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", [file_key])
+
+
+def object_exists(file_key):
+    try:
+        get_minio_client().head_object(Bucket=BUCKET, Key=file_key)
+    except ClientError as e:
+        if e.response['Error']['Code'] in ('404', 'NoSuchKey', 'NotFound'):
+            return False
+        raise
+    return True
+
+
+def find_content(workspace_id, content_hash):
+    """A WorkspaceFile already holding this content in the workspace, if any."""
+    return WorkspaceFile.objects.filter(
+        workspace_id=workspace_id, content_hash=content_hash,
+    ).order_by('created_at').first()
+
+
+def ensure_stored(fileobj, file_key, content_type=None):
+    """
+    Make sure the object at `file_key` exists before a row referencing it is
+    written. Must run in that row's transaction: the lock keeps
+    `release` from deleting the object until the row is committed.
+    """
+    lock_key(file_key)
+    if not object_exists(file_key):
+        upload_fileobj(fileobj, BUCKET, file_key, content_type=content_type)
+
+
+def release(file_key):
+    """
+    Delete the object at `file_key` and its resized copies, unless a
+    WorkspaceFile still references it.
+    """
+    with transaction.atomic():
+        lock_key(file_key)
+        if WorkspaceFile.objects.filter(file_key=file_key).exists():
+            return
+        keys = [file_key] + [derivative_key(file_key, size) for size in settings.MINIO_DERIVATIVES['SIZES']]
+        # Missing keys are not an error for S3
+        get_minio_client().delete_objects(
+            Bucket=BUCKET,
+            Delete={'Objects': [{'Key': key} for key in keys], 'Quiet': True},
+        )
+    logger.info(f"Released {file_key}")
@@ -0,0 +1,21 @@
+import django
+from django.core.management.base import BaseCommand
+from rq import Worker
+
+django.setup()
+
+from portal.storage.redis_client import redis
+
+class Command(BaseCommand):
+    help = 'Run RQ worker for storage (image derivatives)'
+
+    def handle(self, *args, **kargs):
+        worker = Worker(
+            queues=['storage'],
+            connection=redis.get_con(),
+        )
+        try:
+            print("Starting worker...")
+            worker.work()
+        except KeyboardInterrupt:
+            print("Shutting down worker...")
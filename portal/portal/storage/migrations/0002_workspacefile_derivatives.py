@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('storage', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workspacefile',
+            name='derivatives',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
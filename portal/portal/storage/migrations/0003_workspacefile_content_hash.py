@@ -0,0 +1,26 @@
+# Generated by Django 5.2.3 on 2026-10-18 11:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('storage', '0002_workspacefile_derivatives'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workspacefile',
+            name='content_hash',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='workspacefile',
+            index=models.Index(fields=['workspace', 'content_hash'], name='storage_wor_workspa_3d43ae_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workspacefile',
+            index=models.Index(fields=['file_key'], name='storage_wor_file_ke_f1dd9d_idx'),
+        ),
+    ]
@@ -1,11 +1,102 @@
-from boto3 import client
+import os
+import threading
+
+from boto3.s3.transfer import TransferConfig
+from boto3.session import Session
+from botocore.config import Config
 from django.conf import settings
 
-def get_minio_client():
-    return client(
+_clients = {}  # endpoint -> client
+_lock = threading.Lock()
+
+
+def _reset_after_fork():
+    # Connection pools must not be shared with the parent process
+    global _lock
+    _clients.clear()
+    _lock = threading.Lock()
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_minio_client(endpoint_url=None):
+    """
+    S3 client for `endpoint_url` (MINIO_ENDPOINT by default), created once per
+    process and shared by all threads. boto3 clients are thread-safe, and
+    reusing one keeps botocore's loaded service model and its connection pool
+    (see MINIO_CLIENT).
+    """
+    endpoint_url = endpoint_url or settings.MINIO_ENDPOINT
+    minio_client = _clients.get(endpoint_url)
+    if minio_client is None:
+        with _lock:
+            minio_client = _clients.get(endpoint_url)
+            if minio_client is None:
+                minio_client = _clients[endpoint_url] = _create_client(endpoint_url)
+    return minio_client
+
+
+def _create_client(endpoint_url):
+    options = settings.MINIO_CLIENT
+    # Sessions are not thread-safe, unlike the clients they create
+    return Session().client(
         's3',
-        endpoint_url=settings.MINIO_ENDPOINT,
+        endpoint_url=endpoint_url,
         aws_access_key_id=settings.MINIO_ACCESS_KEY,
         aws_secret_access_key=settings.MINIO_SECRET_KEY,
-        use_ssl=settings.MINIO_SECURE
+        use_ssl=settings.MINIO_SECURE if endpoint_url == settings.MINIO_ENDPOINT else endpoint_url.startswith('https://'),
+        config=Config(
+            # Otherwise boto3 presigns with the legacy SigV2
+            signature_version='s3v4',
+            max_pool_connections=options['MAX_POOL_CONNECTIONS'],
+            connect_timeout=options['CONNECT_TIMEOUT'],
+            read_timeout=options['READ_TIMEOUT'],
+            tcp_keepalive=options['TCP_KEEPALIVE'],
+            retries={'total_max_attempts': options['MAX_ATTEMPTS'], 'mode': 'standard'},
+        ),
+    )
+
+
+def warmup():
+    """Create the clients up front, so the first requests don't pay for it."""
+    get_minio_client()
+    if settings.MINIO_DOWNLOAD['PUBLIC_ENDPOINT']:
+        get_minio_client(settings.MINIO_DOWNLOAD['PUBLIC_ENDPOINT'])
+
+def upload_fileobj(fileobj, bucket, key, content_type=None):
+    """
+    Stream `fileobj` to MinIO without reading it whole: files larger than
+    ``MINIO_UPLOAD['PART_SIZE']`` go as a multipart upload, sending up to
+    ``MINIO_UPLOAD['CONCURRENCY']`` parts at a time.
+    """
+    part_size = settings.MINIO_UPLOAD['PART_SIZE']
+    concurrency = settings.MINIO_UPLOAD['CONCURRENCY']
+    config = TransferConfig(
+        multipart_threshold=part_size,
+        multipart_chunksize=part_size,
+        max_concurrency=concurrency,
+        use_threads=concurrency > 1,
+    )
+    fileobj.seek(0)
+    get_minio_client().upload_fileobj(
+        fileobj, bucket, key,
+        ExtraArgs={'ContentType': content_type} if content_type else None,
+        Config=config,
+    )
+
+def presigned_get_url(bucket, key, content_type=None, content_disposition=None):
+    """
+    Short-lived (``MINIO_DOWNLOAD['URL_TTL']``) GET URL for `key`, signed for
+    ``MINIO_DOWNLOAD['PUBLIC_ENDPOINT']`` when MinIO is reached by clients on
+    another host than by the app. MinIO answers with the given Content-Type
+    and Content-Disposition.
+    """
+    params = {'Bucket': bucket, 'Key': key}
+    if content_type:
+        params['ResponseContentType'] = content_type
+    if content_disposition:
+        params['ResponseContentDisposition'] = content_disposition
+    # Signing is local, no request is made
+    return get_minio_client(settings.MINIO_DOWNLOAD['PUBLIC_ENDPOINT']).generate_presigned_url(
+        'get_object', Params=params, ExpiresIn=settings.MINIO_DOWNLOAD['URL_TTL'],
     )
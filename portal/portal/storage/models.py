@@ -10,18 +10,26 @@ class WorkspaceFile(models.Model):
         Workspace, on_delete=models.CASCADE, related_name='files'
     )
     file_key = models.CharField(max_length=255)  # MinIO object path
+    # SHA-256 of the content, rows with the same one share the object
+    content_hash = models.CharField(max_length=64, null=True, blank=True)
     file_name = models.CharField(max_length=255)  # Original file name
     content_type = models.CharField(max_length=100)  # MIME type
     file_size = models.BigIntegerField()  # Size in bytes
     created_by = models.ForeignKey(
         User, on_delete=models.SET_NULL, null=True, related_name='uploaded_files'
     )
+    # Resized copies stored next to the original, by size name (see
+    # MINIO_DERIVATIVES): {'key', 'content_type', 'file_size', 'width', 'height'},
+    # or None when the original is served instead. Empty until generated.
+    derivatives = models.JSONField(default=dict, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         indexes = [
             models.Index(fields=['workspace']),
             models.Index(fields=['id']),
+            models.Index(fields=['workspace', 'content_hash']),
+            models.Index(fields=['file_key']),
         ]
 
     def __str__(self):
@@ -0,0 +1,42 @@
+UNSATISFIABLE_RANGE = object()
+
+
+def etag_matches(if_none_match, etag):
+    """Whether an If-None-Match header matches `etag` (weak comparison)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*' or candidate.removeprefix('W/') == etag.removeprefix('W/'):
+            return True
+    return False
+
+
+def parse_range(header, size):
+    """
+    Byte range requested by a ``Range`` header, as an inclusive
+    ``(start, end)`` within `size`, None to serve the whole file, or
+    UNSATISFIABLE_RANGE.
+
+    Only single ranges are honored; multiple ranges and malformed headers
+    are ignored, which the RFC allows.
+    """
+    if not header or not header.startswith('bytes=') or ',' in header or size <= 0:
+        return None
+    start, _, end = header[len('bytes='):].strip().partition('-')
+    try:
+        if not start:
+            # Suffix range: the last `end` bytes
+            length = int(end)
+            if length <= 0:
+                return UNSATISFIABLE_RANGE
+            return max(size - length, 0), size - 1
+        start = int(start)
+        end = int(end) if end else size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        return UNSATISFIABLE_RANGE
+    if start > end:
+        return None
+    return start, min(end, size - 1)
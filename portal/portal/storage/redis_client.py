@@ -0,0 +1,7 @@
+from portal.utils.redis_pool import RQRedisClient
+
+class RedisClient(RQRedisClient):
+    def __init__(self):
+        super().__init__('PORTAL_STORAGE_RQ_REDIS_URL')
+
+redis = RedisClient()
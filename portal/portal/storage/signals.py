@@ -0,0 +1,43 @@
+import logging
+
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from portal.storage.blobs import release
+from portal.storage.models import WorkspaceFile
+from portal.storage.redis_client import redis
+
+logger = logging.getLogger(__name__)
+
+@receiver(post_save, sender='workspace.TaskCommentFile')
+def queue_file_derivatives(sender, instance, created, **kwargs):
+    # Derivatives are copied over when the same content was uploaded before
+    if created and instance.file.content_type.startswith('image/') and not instance.file.derivatives:
+        file_id = str(instance.file_id)
+        # After commit, so the worker finds the file row
+        transaction.on_commit(lambda: redis.get_queue('storage').enqueue(
+            'portal.storage.tasks.generate_derivatives', file_id,
+        ))
+
+@receiver(post_delete, sender='workspace.TaskCommentFile')
+def delete_unused_file(sender, instance, origin=None, **kwargs):
+    # Deleted along with the file, or the whole workspace
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin is not None and model._meta.label in ('storage.WorkspaceFile', 'workspace.Workspace', 'workspace.Organization'):
+        return
+    WorkspaceFile.objects.filter(id=instance.file_id, task_comment_files__isnull=True).delete()
+
+@receiver(post_delete, sender=WorkspaceFile)
+def release_file_object(sender, instance, **kwargs):
+    file_key = instance.file_key
+
+    def release_object():
+        try:
+            release(file_key)
+        except Exception:
+            logger.exception(f"Failed to release {file_key}")
+
+    # Once the row is gone for good, other uploads may still reference it
+    transaction.on_commit(release_object)
@@ -0,0 +1,61 @@
+import io
+import logging
+import tempfile
+
+from django.conf import settings
+from PIL import Image, ImageOps
+
+from portal.storage.blobs import BUCKET, derivative_key
+from portal.storage.minio_client import get_minio_client, upload_fileobj
+from portal.storage.models import WorkspaceFile
+
+logger = logging.getLogger(__name__)
+
+
+def generate_derivatives(workspace_file_id):
+    """
+    Store WebP copies of an image attachment resized to fit each of
+    ``MINIO_DERIVATIVES['SIZES']``, next to the original, and record them on
+    the WorkspaceFiles sharing the object. Sizes the original already fits
+    in (or all of them, if it can't be decoded) are recorded as None, the
+    download route serves the original for them.
+    """
+    workspace_file = WorkspaceFile.objects.get(id=workspace_file_id)
+    minio_client = get_minio_client()
+
+    # Spooled to disk past a few MiB, like uploads
+    with tempfile.SpooledTemporaryFile(max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE) as original:
+        minio_client.download_fileobj(BUCKET, workspace_file.file_key, original)
+        original.seek(0)
+        try:
+            image = Image.open(original)
+            image = ImageOps.exif_transpose(image)
+        except (OSError, Image.DecompressionBombError) as e:
+            logger.warning(f"Skipping derivatives of {workspace_file.file_key}: {e}")
+            WorkspaceFile.objects.filter(file_key=workspace_file.file_key).update(
+                derivatives=dict.fromkeys(settings.MINIO_DERIVATIVES['SIZES']),
+            )
+            return
+
+        derivatives = {}
+        for size, box in settings.MINIO_DERIVATIVES['SIZES'].items():
+            if image.width <= box and image.height <= box:
+                derivatives[size] = None
+                continue
+            resized = image.copy()
+            resized.thumbnail((box, box))
+            if resized.mode not in ('RGB', 'RGBA'):
+                resized = resized.convert('RGBA' if 'A' in resized.getbands() else 'RGB')
+            data = io.BytesIO()
+            resized.save(data, 'WEBP', quality=settings.MINIO_DERIVATIVES['QUALITY'])
+            key = derivative_key(workspace_file.file_key, size)
+            upload_fileobj(data, BUCKET, key, content_type='image/webp')
+            derivatives[size] = {
+                'key': key,
+                'content_type': 'image/webp',
+                'file_size': len(data.getvalue()),
+                'width': resized.width,
+                'height': resized.height,
+            }
+
+    WorkspaceFile.objects.filter(file_key=workspace_file.file_key).update(derivatives=derivatives)
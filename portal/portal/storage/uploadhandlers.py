@@ -0,0 +1,52 @@
+import hashlib
+
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+
+
+class MaxSizeUploadHandler(FileUploadHandler):
+    """
+    First of FILE_UPLOAD_HANDLERS: drops files larger than
+    ``MINIO_UPLOAD['MAX_SIZE']`` while the request is parsed, so they are
+    neither kept in memory nor spooled to disk by the following handlers.
+    Views tell a dropped file from a missing one through
+    ``request.upload_too_large``.
+    """
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None, content_type_extra=None):
+        self.max_size = settings.MINIO_UPLOAD['MAX_SIZE']
+        if content_length is not None and content_length > self.max_size:
+            self.request.upload_too_large = True
+            raise SkipFile()
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > self.max_size:
+            self.request.upload_too_large = True
+            raise SkipFile()
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None
+
+
+class HashingUploadHandler(FileUploadHandler):
+    """
+    Computes the SHA-256 of each file while the request is parsed, passing the
+    data through to the following handlers. Digests end up in
+    ``request.upload_hashes`` by field name, so files are stored by content
+    (see portal.storage.blobs) without being read a second time.
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.sha256 = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.sha256.update(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size):
+        if not hasattr(self.request, 'upload_hashes'):
+            self.request.upload_hashes = {}
+        self.request.upload_hashes[self.field_name] = self.sha256.hexdigest()
+        return None
@@ -0,0 +1,80 @@
+import threading
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from redis import BlockingConnectionPool, Redis
+from rq import Queue
+
+_pools = {}
+_lock = threading.Lock()
+
+
+def get_connection_pool(url, decode_responses=False):
+    """
+    Return the process-wide connection pool for a Redis URL, creating it on
+    first use. Pools are shared by every client in the process (middleware,
+    signals, RQ queues and tasks) and are bounded by
+    ``PORTAL_REDIS_POOL['MAX_CONNECTIONS']``; callers block up to
+    ``PORTAL_REDIS_POOL['TIMEOUT']`` seconds for a free connection.
+    """
+    key = (url, decode_responses)
+    pool = _pools.get(key)
+    if pool is None:
+        with _lock:
+            pool = _pools.get(key)
+            if pool is None:
+                config = getattr(settings, 'PORTAL_REDIS_POOL', {})
+                pool = BlockingConnectionPool.from_url(
+                    url,
+                    max_connections=config.get('MAX_CONNECTIONS', 50),
+                    timeout=config.get('TIMEOUT', 20),
+                    health_check_interval=config.get('HEALTH_CHECK_INTERVAL', 30),
+                    socket_keepalive=True,
+                    decode_responses=decode_responses,
+                )
+                _pools[key] = pool
+    return pool
+
+
+def get_redis(url, decode_responses=False):
+    """Return a Redis client backed by the shared pool for `url`."""
+    return Redis(connection_pool=get_connection_pool(url, decode_responses))
+
+
+def pool_stats():
+    """Connection usage of every pool in this process, keyed by host/db."""
+    stats = {}
+    for (url, decode_responses), pool in list(_pools.items()):
+        parts = urlsplit(url)
+        name = f"{parts.hostname}:{parts.port or 6379}{parts.path or '/0'}"
+        if decode_responses:
+            name += ' (decoded)'
+        created = len(pool._connections)
+        idle = sum(1 for connection in list(pool.pool.queue) if connection is not None)
+        stats[name] = {
+            'max_connections': pool.max_connections,
+            'created': created,
+            'in_use': created - idle,
+            'idle': idle,
+        }
+    return stats
+
+
+class RQRedisClient:
+    """
+    Lazy RQ connection holder: nothing is created until the first `get_con`,
+    and every call shares the pool of `url_setting`.
+    """
+
+    def __init__(self, url_setting):
+        self.url_setting = url_setting
+        self.queues = {}
+
+    def get_con(self):
+        return get_redis(getattr(settings, self.url_setting))
+
+    def get_queue(self, name):
+        queue = self.queues.get(name)
+        if queue is None:
+            queue = self.queues[name] = Queue(name, connection=self.get_con())
+        return queue
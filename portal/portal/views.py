@@ -1,4 +1,10 @@
 from django.http import JsonResponse
 
+from portal.utils.redis_pool import pool_stats
+
 def health_check(request):
-    return JsonResponse({'status': 'ok'}, status=200)
+    data = {'status': 'ok'}
+    # Pool stats name internal hosts, staff only
+    if request.user.is_authenticated and request.user.is_staff:
+        data['redis_pools'] = pool_stats()
+    return JsonResponse(data, status=200)
@@ -4,6 +4,65 @@ from django.db import connection
 _thread_locals = threading.local()
 
 
+class RowLevelSecurityContext:
+    """
+    Database execute wrapper that applies the RLS context (role and
+    ``workspace.current_user_id``) right before the first query of a request,
+    in a single ``set_config`` statement. Requests answered without touching
+    the database (e.g. cached 304s) pay nothing.
+
+    Settings are session level because requests run in autocommit. When the
+    first query happens inside a transaction that later rolls back, Postgres
+    discards the settings along with it; an on-commit marker tells the two
+    cases apart so the context is applied again before the next query.
+    """
+
+    def __init__(self, user_id, set_role):
+        self.user_id = str(user_id) if user_id else ''
+        self.set_role = set_role
+        self.applied_on = None  # raw connection the context was applied on
+        self.committed = False
+
+    def __call__(self, execute, sql, params, many, context):
+        if not self.is_applied():
+            self.apply(context['cursor'])
+        return execute(sql, params, many, context)
+
+    def is_applied(self):
+        if self.applied_on is None or self.applied_on is not connection.connection:
+            return False
+        if self.committed:
+            return True
+        # Still waiting for the transaction that applied it: the marker is
+        # dropped from the queue when that transaction is rolled back.
+        return any(entry[1] == self.mark_committed for entry in connection.run_on_commit)
+
+    def mark_committed(self):
+        self.committed = True
+
+    def apply(self, cursor):
+        if self.set_role:
+            sql = "SELECT set_config('role', 'portal', false), set_config('workspace.current_user_id', %s, false)"
+        else:
+            sql = "SELECT set_config('workspace.current_user_id', %s, false)"
+        # Run on the DB-API cursor so the statement skips the wrappers
+        cursor.cursor.execute(sql, [self.user_id])
+        self.applied_on = connection.connection
+        self.committed = False
+        # Runs immediately in autocommit, on COMMIT otherwise
+        connection.on_commit(self.mark_committed)
+
+    def reset(self):
+        if self.applied_on is None or self.applied_on is not connection.connection:
+            return
+        with connection.cursor() as cursor:
+            if self.set_role:
+                cursor.execute("SELECT set_config('role', 'none', false), set_config('workspace.current_user_id', '', false)")
+            else:
+                cursor.execute("SELECT set_config('workspace.current_user_id', '', false)")
+        self.applied_on = None
+
+
 class CurrentUserMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
@@ -15,21 +74,17 @@ class CurrentUserMiddleware:
         # Skip role change for staff users or /admin/ paths
         is_admin = request.path.startswith('/admin/') or (request.user.is_authenticated and request.user.is_staff)
 
-        # Set session role and current_user_id
-        with connection.cursor() as cursor:
-            if not is_admin:
-                cursor.execute("SET ROLE portal")
-            if request.user.is_authenticated and request.user.id:
-                cursor.execute("SET workspace.current_user_id = %s", [str(request.user.id)])
-            else:
-                cursor.execute("RESET workspace.current_user_id")
-
-        response = self.get_response(request)
-
-        _thread_locals.user = None
-        with connection.cursor() as cursor:
-            cursor.execute("RESET ROLE")
-            cursor.execute("RESET workspace.current_user_id")
+        # Session role and current_user_id are set on the first query only
+        rls = RowLevelSecurityContext(
+            request.user.id if request.user.is_authenticated else None,
+            set_role=not is_admin,
+        )
+        try:
+            with connection.execute_wrapper(rls):
+                response = self.get_response(request)
+        finally:
+            _thread_locals.user = None
+            rls.reset()
 
         return response
 
@@ -0,0 +1,945 @@
+from django.db import migrations
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspace', '0006_policy'),
+    ]
+
+    operations = [
+        # Membership lookups evaluated once per statement. Policies compare
+        # workspace_id against the array with `= ANY ((SELECT ...))`: the
+        # sub-select turns the call into an InitPlan, so the array is built
+        # once and the comparison can use the workspace_id indexes instead of
+        # calling workspace_check_workspace_role for every row.
+        # SECURITY DEFINER lets the lookup read workspace_workspacemember
+        # without re-entering its own RLS policies.
+        migrations.RunSQL(
+            sql="""
+            CREATE OR REPLACE FUNCTION workspace_current_user_id()
+            RETURNS INTEGER AS $$
+                SELECT NULLIF(current_setting('workspace.current_user_id', true), '')::integer;
+            $$ LANGUAGE sql STABLE;
+
+            CREATE OR REPLACE FUNCTION workspace_member_workspaces(roles TEXT[] DEFAULT NULL)
+            RETURNS UUID[] AS $$
+                SELECT COALESCE(array_agg(workspace_id), '{}')
+                FROM workspace_workspacemember
+                WHERE user_id = workspace_current_user_id()
+                AND (roles IS NULL OR role = ANY (roles));
+            $$ LANGUAGE sql STABLE SECURITY DEFINER SET search_path = public;
+            """,
+            reverse_sql="""
+            DROP FUNCTION IF EXISTS workspace_member_workspaces;
+            DROP FUNCTION IF EXISTS workspace_current_user_id;
+            """
+        ),
+        # Workspace policies
+        migrations.RunSQL(
+            sql="""
+            DROP POLICY IF EXISTS workspace_insert ON workspace_workspace;
+            CREATE POLICY workspace_insert ON workspace_workspace
+            FOR INSERT
+            WITH CHECK (
+                organization_id IN (
+                    SELECT organization_id
+                    FROM workspace_organizationmember
+                    WHERE user_id = (SELECT workspace_current_user_id())
+                )
+            );
+
+            DROP POLICY IF EXISTS workspace_select ON workspace_workspace;
+            CREATE POLICY workspace_select ON workspace_workspace
+            FOR SELECT
+            USING (
+                id = ANY ((SELECT workspace_member_workspaces()))
+            );
+
+            DROP POLICY IF EXISTS workspace_update ON workspace_workspace;
+            CREATE POLICY workspace_update ON workspace_workspace
+            FOR UPDATE
+            USING (
+                id = ANY ((SELECT workspace_member_workspaces('{owner,manager}')))
+            );
+
+            DROP POLICY IF EXISTS workspace_delete ON workspace_workspace;
+            CREATE POLICY workspace_delete ON workspace_workspace
+            FOR DELETE
+            USING (
+                id = ANY ((SELECT workspace_member_workspaces('{owner}')))
+            );
+            """,
+            reverse_sql="""
+            DROP POLICY IF EXISTS workspace_insert ON workspace_workspace;
+            CREATE POLICY workspace_insert ON workspace_workspace
+            FOR INSERT
+            WITH CHECK (
+                organization_id IN (
+                    SELECT organization_id
+                    FROM workspace_organizationmember
+                    WHERE user_id = current_setting('workspace.current_user_id')::integer
+                )
+            );
+
+            DROP POLICY IF EXISTS workspace_select ON workspace_workspace;
+            CREATE POLICY workspace_select ON workspace_workspace
+            FOR SELECT
+            USING (
+                workspace_check_workspace_role(id, current_setting('workspace.current_user_id')::integer) != ''
+            );
+
+            DROP POLICY IF EXISTS workspace_update ON workspace_workspace;
+            CREATE POLICY workspace_update ON workspace_workspace
+            FOR UPDATE
+            USING (
+                workspace_check_workspace_role(id, current_setting('workspace.current_user_id')::integer) IN ('owner', 'manager')
+            );
+
+            DROP POLICY IF EXISTS workspace_delete ON workspace_workspace;
+            CREATE POLICY workspace_delete ON workspace_workspace
+            FOR DELETE
+            USING (
+                workspace_check_workspace_role(id, current_setting('workspace.current_user_id')::integer) = 'owner'
+            );
+            """
+        ),
+        # WorkspaceMember policies
+        migrations.RunSQL(
+            sql="""
+            DROP POLICY IF EXISTS workspacemember_insert ON workspace_workspacemember;
+            CREATE POLICY workspacemember_insert ON workspace_workspacemember
+            FOR INSERT
+            WITH CHECK (
+                workspace_id = ANY ((SELECT workspace_member_workspaces('{owner,manager}')))
+            );
+
+            DROP POLICY IF EXISTS workspacemember_select ON workspace_workspacemember;
+            CREATE POLICY workspacemember_select ON workspace_workspacemember
+            FOR SELECT
+            USING (
+                workspace_id = ANY ((SELECT workspace_member_workspaces()))
+            );
+
+            DROP POLICY IF EXISTS workspacemember_update ON workspace_workspacemember;
+            CREATE POLICY workspacemember_update ON workspace_workspacemember
+            FOR UPDATE
+            USING (
+                workspace_id = ANY ((SELECT workspace_member_workspaces('{owner,manager}')))
+            );
+
+            DROP POLICY IF EXISTS workspacemember_delete ON workspace_workspacemember;
+            CREATE POLICY workspacemember_delete ON workspace_workspacemember
+            FOR DELETE
+            USING (
+                workspace_id = ANY ((SELECT workspace_member_workspaces('{owner,manager}')))
+            );
+
+            DROP POLICY IF EXISTS workspacemember_self_select ON workspace_workspacemember;
+            CREATE POLICY workspacemember_self_select ON workspace_workspacemember
+            FOR SELECT
+            USING (
+                user_id = (SELECT workspace_current_user_id())
+            );
+            """,
+            reverse_sql="""
+            DROP POLICY IF EXISTS workspacemember_insert ON workspace_workspacemember;
+            CREATE POLICY workspacemember_insert ON workspace_workspacemember
+            FOR INSERT
+            WITH CHECK (
+                workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) IN ('owner', 'manager')
+            );
+
+            DROP POLICY IF EXISTS workspacemember_select ON workspace_workspacemember;
+            CREATE POLICY workspacemember_select ON workspace_workspacemember
+            FOR SELECT
+            USING (
+                workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) != ''
+            );
+
+            DROP POLICY IF EXISTS workspacemember_update ON workspace_workspacemember;
+            CREATE POLICY workspacemember_update ON workspace_workspacemember
+            FOR UPDATE
+            USING (
+                workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) IN ('owner', 'manager')
+            );
+
+            DROP POLICY IF EXISTS workspacemember_delete ON workspace_workspacemember;
+            CREATE POLICY workspacemember_delete ON workspace_workspacemember
+            FOR DELETE
+            USING (
+                workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) IN ('owner', 'manager')
+            );
+
+            DROP POLICY IF EXISTS workspacemember_self_select ON workspace_workspacemember;
+            CREATE POLICY workspacemember_self_select ON workspace_workspacemember
+            FOR SELECT
+            USING (
+                user_id = current_setting('workspace.current_user_id')::integer
+            );
+            """
+        ),
+        # WorkspaceInvite policies
+        migrations.RunSQL(
+            sql="""
+            DROP POLICY IF EXISTS workspaceinvite_insert ON workspace_workspaceinvite;
+            CREATE POLICY workspaceinvite_insert ON workspace_workspaceinvite
+            FOR INSERT
+            WITH CHECK (
+                workspace_id = ANY ((SELECT workspace_member_workspaces('{owner,manager}')))
+            );
+
+            DROP POLICY IF EXISTS workspaceinvite_select ON workspace_workspaceinvite;
+            CREATE POLICY workspaceinvite_select ON workspace_workspaceinvite
+            FOR SELECT
+            USING (
+                workspace_id = ANY ((SELECT workspace_member_workspaces()))
+            );
+
+            DROP POLICY IF EXISTS workspaceinvite_update ON workspace_workspaceinvite;
+            CREATE POLICY workspaceinvite_update ON workspace_workspaceinvite
+            FOR UPDATE
+            USING (
+                workspace_id = ANY ((SELECT workspace_member_workspaces('{owner,manager}')))
+            );
+
+            DROP POLICY IF EXISTS workspaceinvite_delete ON workspace_workspaceinvite;
+            CREATE POLICY workspaceinvite_delete ON workspace_workspaceinvite
+            FOR DELETE
+            USING (
+                workspace_id = ANY ((SELECT workspace_member_workspaces('{owner,manager}')))
+            );
+            """,
+            reverse_sql="""
+            DROP POLICY IF EXISTS workspaceinvite_insert ON workspace_workspaceinvite;
+            CREATE POLICY workspaceinvite_insert ON workspace_workspaceinvite
+            FOR INSERT
+            WITH CHECK (
+                workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) IN ('owner', 'manager')
+            );
+
+            DROP POLICY IF EXISTS workspaceinvite_select ON workspace_workspaceinvite;
+            CREATE POLICY workspaceinvite_select ON workspace_workspaceinvite
+            FOR SELECT
+            USING (
+                workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) != ''
+            );
+
+            DROP POLICY IF EXISTS workspaceinvite_update ON workspace_workspaceinvite;
+            CREATE POLICY workspaceinvite_update ON workspace_workspaceinvite
+            FOR UPDATE
+            USING (
+                workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) IN ('owner', 'manager')
+            );
+
+            DROP POLICY IF EXISTS workspaceinvite_delete ON workspace_workspaceinvite;
+            CREATE POLICY workspaceinvite_delete ON workspace_workspaceinvite
+            FOR DELETE
+            USING (
+                workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) IN ('owner', 'manager')
+            );
+            """
+        ),
+        # Category and Stage policies
+        migrations.RunSQL(
+            sql="""
+            DROP POLICY IF EXISTS category_select ON workspace_category;
+            CREATE POLICY category_select ON workspace_category
+            FOR SELECT
+            USING (
+                workspace_id = ANY ((SELECT workspace_member_workspaces()))
+            );
+
+            DROP POLICY IF EXISTS category_insert ON workspace_category;
+            CREATE POLICY category_insert ON workspace_category
+            FOR INSERT
+            WITH CHECK (
+                workspace_id = ANY ((SELECT workspace_member_workspaces('{owner,manager}')))
+            );
+
+            DROP POLICY IF EXISTS category_update ON workspace_category;
+            CREATE POLICY category_update ON workspace_category
+            FOR UPDATE
+            USING (
+                workspace_id = ANY ((SELECT workspace_member_workspaces('{owner,manager}')))
+            );
+
+            DROP POLICY IF EXISTS category_delete ON workspace_category;
+            CREATE POLICY category_delete ON workspace_category
+            FOR DELETE
+            USING (
+                workspace_id = ANY ((SELECT workspace_member_workspaces('{owner,manager}')))
+            );
+
+            DROP POLICY IF EXISTS stage_select ON workspace_stage;
+            CREATE POLICY stage_select ON workspace_stage
+            FOR SELECT
+            USING (
+                workspace_id = ANY ((SELECT workspace_member_workspaces()))
+            );
+
+            DROP POLICY IF EXISTS stage_insert ON workspace_stage;
+            CREATE POLICY stage_insert ON workspace_stage
+            FOR INSERT
+            WITH CHECK (
+                workspace_id = ANY ((SELECT workspace_member_workspaces('{owner,manager}')))
+            );
+
+            DROP POLICY IF EXISTS stage_update ON workspace_stage;
+            CREATE POLICY stage_update ON workspace_stage
+            FOR UPDATE
+            USING (
+                workspace_id = ANY ((SELECT workspace_member_workspaces('{owner,manager}')))
+            );
+
+            DROP POLICY IF EXISTS stage_delete ON workspace_stage;
+            CREATE POLICY stage_delete ON workspace_stage
+            FOR DELETE
+            USING (
+                workspace_id = ANY ((SELECT workspace_member_workspaces('{owner,manager}')))
+            );
+            """,
+            reverse_sql="""
+            DROP POLICY IF EXISTS category_select ON workspace_category;
+            CREATE POLICY category_select ON workspace_category
+            FOR SELECT
+            USING (
+                workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) != ''
+            );
+
+            DROP POLICY IF EXISTS category_insert ON workspace_category;
+            CREATE POLICY category_insert ON workspace_category
+            FOR INSERT
+            WITH CHECK (
+                workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) IN ('owner', 'manager')
+            );
+
+            DROP POLICY IF EXISTS category_update ON workspace_category;
+            CREATE POLICY category_update ON workspace_category
+            FOR UPDATE
+            USING (
+                workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) IN ('owner', 'manager')
+            );
+
+            DROP POLICY IF EXISTS category_delete ON workspace_category;
+            CREATE POLICY category_delete ON workspace_category
+            FOR DELETE
+            USING (
+                workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) IN ('owner', 'manager')
+            );
+
+            DROP POLICY IF EXISTS stage_select ON workspace_stage;
+            CREATE POLICY stage_select ON workspace_stage
+            FOR SELECT
+            USING (
+                workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) != ''
+            );
+
+            DROP POLICY IF EXISTS stage_insert ON workspace_stage;
+            CREATE POLICY stage_insert ON workspace_stage
+            FOR INSERT
+            WITH CHECK (
+                workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) IN ('owner', 'manager')
+            );
+
+            DROP POLICY IF EXISTS stage_update ON workspace_stage;
+            CREATE POLICY stage_update ON workspace_stage
+            FOR UPDATE
+            USING (
+                workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) IN ('owner', 'manager')
+            );
+
+            DROP POLICY IF EXISTS stage_delete ON workspace_stage;
+            CREATE POLICY stage_delete ON workspace_stage
+            FOR DELETE
+            USING (
+                workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) IN ('owner', 'manager')
+            );
+            """
+        ),
+        # Task policies
+        migrations.RunSQL(
+            sql="""
+            DROP POLICY IF EXISTS task_select ON workspace_task;
+            CREATE POLICY task_select ON workspace_task
+            FOR SELECT
+            USING (
+                workspace_id = ANY ((SELECT workspace_member_workspaces('{owner,manager}')))
+                OR (workspace_id = ANY ((SELECT workspace_member_workspaces('{user,viewer}')))
+                    AND owner_id = (SELECT workspace_current_user_id()))
+            );
+
+            DROP POLICY IF EXISTS task_insert ON workspace_task;
+            CREATE POLICY task_insert ON workspace_task
+            FOR INSERT
+            WITH CHECK (
+                workspace_id = ANY ((SELECT workspace_member_workspaces('{owner,manager,user}')))
+            );
+
+            DROP POLICY IF EXISTS task_update ON workspace_task;
+            CREATE POLICY task_update ON workspace_task
+            FOR UPDATE
+            USING (
+                workspace_id = ANY ((SELECT workspace_member_workspaces('{owner,manager}')))
+                OR (workspace_id = ANY ((SELECT workspace_member_workspaces('{user,viewer}')))
+                    AND owner_id = (SELECT workspace_current_user_id()))
+            );
+
+            DROP POLICY IF EXISTS task_delete ON workspace_task;
+            CREATE POLICY task_delete ON workspace_task
+            FOR DELETE
+            USING (
+                workspace_id = ANY ((SELECT workspace_member_workspaces('{owner,manager}')))
+                OR (workspace_id = ANY ((SELECT workspace_member_workspaces('{user,viewer}')))
+                    AND owner_id = (SELECT workspace_current_user_id()))
+
+            );
+            """,
+            reverse_sql="""
+            DROP POLICY IF EXISTS task_select ON workspace_task;
+            CREATE POLICY task_select ON workspace_task
+            FOR SELECT
+            USING (
+                workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) in ('owner', 'manager')
+                OR (workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) in ('user', 'viewer')
+                    AND owner_id = current_setting('workspace.current_user_id')::integer)
+            );
+
+            DROP POLICY IF EXISTS task_insert ON workspace_task;
+            CREATE POLICY task_insert ON workspace_task
+            FOR INSERT
+            WITH CHECK (
+                workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) IN ('owner', 'manager', 'user')
+            );
+
+            DROP POLICY IF EXISTS task_update ON workspace_task;
+            CREATE POLICY task_update ON workspace_task
+            FOR UPDATE
+            USING (
+                workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) IN ('owner', 'manager')
+                OR (workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) in ('user', 'viewer')
+                    AND owner_id = current_setting('workspace.current_user_id')::integer)
+            );
+
+            DROP POLICY IF EXISTS task_delete ON workspace_task;
+            CREATE POLICY task_delete ON workspace_task
+            FOR DELETE
+            USING (
+                workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) IN ('owner', 'manager')
+                OR (workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) in ('user', 'viewer')
+                    AND owner_id = current_setting('workspace.current_user_id')::integer)
+
+            );
+            """
+        ),
+        # TaskComment policies
+        migrations.RunSQL(
+            sql="""
+            DROP POLICY IF EXISTS taskcomment_select ON workspace_taskcomment;
+            CREATE POLICY taskcomment_select ON workspace_taskcomment
+            FOR SELECT
+            USING (
+                task_id IN (
+                    SELECT id
+                    FROM workspace_task
+                    WHERE workspace_id = ANY ((SELECT workspace_member_workspaces()))
+                )
+            );
+
+            DROP POLICY IF EXISTS taskcomment_insert ON workspace_taskcomment;
+            CREATE POLICY taskcomment_insert ON workspace_taskcomment
+            FOR INSERT
+            WITH CHECK (
+                author_id = (SELECT workspace_current_user_id())
+                AND task_id IN (
+                    SELECT id
+                    FROM workspace_task
+                    WHERE workspace_id = ANY ((SELECT workspace_member_workspaces('{owner,manager}')))
+                    OR owner_id = (SELECT workspace_current_user_id())
+                )
+            );
+
+            DROP POLICY IF EXISTS taskcomment_update ON workspace_taskcomment;
+            CREATE POLICY taskcomment_update ON workspace_taskcomment
+            FOR UPDATE
+            USING (
+                author_id = (SELECT workspace_current_user_id())
+            );
+
+            DROP POLICY IF EXISTS taskcomment_delete ON workspace_taskcomment;
+            CREATE POLICY taskcomment_delete ON workspace_taskcomment
+            FOR DELETE
+            USING (
+                author_id = (SELECT workspace_current_user_id())
+                OR (SELECT workspace_id FROM workspace_task WHERE id = task_id) = ANY ((SELECT workspace_member_workspaces('{owner,manager}')))
+            );
+            """,
+            reverse_sql="""
+            DROP POLICY IF EXISTS taskcomment_select ON workspace_taskcomment;
+            CREATE POLICY taskcomment_select ON workspace_taskcomment
+            FOR SELECT
+            USING (
+                task_id IN (
+                    SELECT id
+                    FROM workspace_task
+                    WHERE workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) != ''
+                )
+            );
+
+            DROP POLICY IF EXISTS taskcomment_insert ON workspace_taskcomment;
+            CREATE POLICY taskcomment_insert ON workspace_taskcomment
+            FOR INSERT
+            WITH CHECK (
+                author_id = current_setting('workspace.current_user_id')::integer
+                AND task_id IN (
+                    SELECT id
+                    FROM workspace_task
+                    WHERE workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) IN ('owner', 'manager')
+                    OR workspace_is_assigned(workspace_id, current_setting('workspace.current_user_id')::integer, id, NULL)
+                )
+            );
+
+            DROP POLICY IF EXISTS taskcomment_update ON workspace_taskcomment;
+            CREATE POLICY taskcomment_update ON workspace_taskcomment
+            FOR UPDATE
+            USING (
+                author_id = current_setting('workspace.current_user_id')::integer
+            );
+
+            DROP POLICY IF EXISTS taskcomment_delete ON workspace_taskcomment;
+            CREATE POLICY taskcomment_delete ON workspace_taskcomment
+            FOR DELETE
+            USING (
+                author_id = current_setting('workspace.current_user_id')::integer
+                OR workspace_check_workspace_role(
+                    (SELECT workspace_id FROM workspace_task WHERE id = task_id),
+                    current_setting('workspace.current_user_id')::integer
+                ) IN ('owner', 'manager')
+            );
+            """
+        ),
+        # TaskCommentFile policies
+        migrations.RunSQL(
+            sql="""
+            DROP POLICY IF EXISTS taskcommentfile_select ON workspace_taskcommentfile;
+            CREATE POLICY taskcommentfile_select ON workspace_taskcommentfile
+            FOR SELECT
+            USING (
+                task_id IN (
+                    SELECT id
+                    FROM workspace_task
+                    WHERE workspace_id = ANY ((SELECT workspace_member_workspaces()))
+                )
+            );
+
+            DROP POLICY IF EXISTS taskcommentfile_insert ON workspace_taskcommentfile;
+            CREATE POLICY taskcommentfile_insert ON workspace_taskcommentfile
+            FOR INSERT
+            WITH CHECK (
+                owner_id = (SELECT workspace_current_user_id())
+                AND task_id IN (
+                    SELECT id
+                    FROM workspace_task
+                    WHERE workspace_id = ANY ((SELECT workspace_member_workspaces('{owner,manager}')))
+                    OR owner_id = (SELECT workspace_current_user_id())
+                )
+            );
+
+            DROP POLICY IF EXISTS taskcommentfile_delete ON workspace_taskcommentfile;
+            CREATE POLICY taskcommentfile_delete ON workspace_taskcommentfile
+            FOR DELETE
+            USING (
+                owner_id = (SELECT workspace_current_user_id())
+                OR (SELECT workspace_id FROM workspace_task WHERE id = task_id) = ANY ((SELECT workspace_member_workspaces('{owner,manager}')))
+            );
+            """,
+            reverse_sql="""
+            DROP POLICY IF EXISTS taskcommentfile_select ON workspace_taskcommentfile;
+            CREATE POLICY taskcommentfile_select ON workspace_taskcommentfile
+            FOR SELECT
+            USING (
+                task_id IN (
+                    SELECT id
+                    FROM workspace_task
+                    WHERE workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) != ''
+                )
+            );
+
+            DROP POLICY IF EXISTS taskcommentfile_insert ON workspace_taskcommentfile;
+            CREATE POLICY taskcommentfile_insert ON workspace_taskcommentfile
+            FOR INSERT
+            WITH CHECK (
+                owner_id = current_setting('workspace.current_user_id')::integer
+                AND task_id IN (
+                    SELECT id
+                    FROM workspace_task
+                    WHERE workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) IN ('owner', 'manager')
+                    OR workspace_is_assigned(workspace_id, current_setting('workspace.current_user_id')::integer, id, NULL)
+                )
+            );
+
+            DROP POLICY IF EXISTS taskcommentfile_delete ON workspace_taskcommentfile;
+            CREATE POLICY taskcommentfile_delete ON workspace_taskcommentfile
+            FOR DELETE
+            USING (
+                owner_id = current_setting('workspace.current_user_id')::integer
+                OR workspace_check_workspace_role(
+                    (SELECT workspace_id FROM workspace_task WHERE id = task_id),
+                    current_setting('workspace.current_user_id')::integer
+                ) IN ('owner', 'manager')
+            );
+            """
+        ),
+        # Chore policies
+        migrations.RunSQL(
+            sql="""
+            DROP POLICY IF EXISTS chore_select ON workspace_chore;
+            CREATE POLICY chore_select ON workspace_chore
+            FOR SELECT
+            USING (
+                workspace_id = ANY ((SELECT workspace_member_workspaces()))
+            );
+
+            DROP POLICY IF EXISTS chore_insert ON workspace_chore;
+            CREATE POLICY chore_insert ON workspace_chore
+            FOR INSERT
+            WITH CHECK (
+                workspace_id = ANY ((SELECT workspace_member_workspaces('{owner,manager}')))
+            );
+
+            DROP POLICY IF EXISTS chore_update ON workspace_chore;
+            CREATE POLICY chore_update ON workspace_chore
+            FOR UPDATE
+            USING (
+                workspace_id = ANY ((SELECT workspace_member_workspaces('{owner,manager}')))
+            );
+
+            DROP POLICY IF EXISTS chore_delete ON workspace_chore;
+            CREATE POLICY chore_delete ON workspace_chore
+            FOR DELETE
+            USING (
+                workspace_id = ANY ((SELECT workspace_member_workspaces('{owner,manager}')))
+            );
+            """,
+            reverse_sql="""
+            DROP POLICY IF EXISTS chore_select ON workspace_chore;
+            CREATE POLICY chore_select ON workspace_chore
+            FOR SELECT
+            USING (
+                workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) != ''
+            );
+
+            DROP POLICY IF EXISTS chore_insert ON workspace_chore;
+            CREATE POLICY chore_insert ON workspace_chore
+            FOR INSERT
+            WITH CHECK (
+                workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) IN ('owner', 'manager')
+            );
+
+            DROP POLICY IF EXISTS chore_update ON workspace_chore;
+            CREATE POLICY chore_update ON workspace_chore
+            FOR UPDATE
+            USING (
+                workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) IN ('owner', 'manager')
+            );
+
+            DROP POLICY IF EXISTS chore_delete ON workspace_chore;
+            CREATE POLICY chore_delete ON workspace_chore
+            FOR DELETE
+            USING (
+                workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) IN ('owner', 'manager')
+            );
+            """
+        ),
+        # ChoreResponsible policies
+        migrations.RunSQL(
+            sql="""
+            DROP POLICY IF EXISTS choreresponsible_select ON workspace_choreresponsible;
+            CREATE POLICY choreresponsible_select ON workspace_choreresponsible
+            FOR SELECT
+            USING (
+                chore_id IN (
+                    SELECT id
+                    FROM workspace_chore
+                    WHERE workspace_id = ANY ((SELECT workspace_member_workspaces()))
+                )
+            );
+
+            DROP POLICY IF EXISTS choreresponsible_insert ON workspace_choreresponsible;
+            CREATE POLICY choreresponsible_insert ON workspace_choreresponsible
+            FOR INSERT
+            WITH CHECK (
+                chore_id IN (
+                    SELECT id
+                    FROM workspace_chore
+                    WHERE workspace_id = ANY ((SELECT workspace_member_workspaces('{owner,manager}')))
+                )
+            );
+
+            DROP POLICY IF EXISTS choreresponsible_update ON workspace_choreresponsible;
+            CREATE POLICY choreresponsible_update ON workspace_choreresponsible
+            FOR UPDATE
+            USING (
+                chore_id IN (
+                    SELECT id
+                    FROM workspace_chore
+                    WHERE workspace_id = ANY ((SELECT workspace_member_workspaces('{owner,manager}')))
+                )
+            );
+
+            DROP POLICY IF EXISTS choreresponsible_delete ON workspace_choreresponsible;
+            CREATE POLICY choreresponsible_delete ON workspace_choreresponsible
+            FOR DELETE
+            USING (
+                chore_id IN (
+                    SELECT id
+                    FROM workspace_chore
+                    WHERE workspace_id = ANY ((SELECT workspace_member_workspaces('{owner,manager}')))
+                )
+            );
+            """,
+            reverse_sql="""
+            DROP POLICY IF EXISTS choreresponsible_select ON workspace_choreresponsible;
+            CREATE POLICY choreresponsible_select ON workspace_choreresponsible
+            FOR SELECT
+            USING (
+                chore_id IN (
+                    SELECT id
+                    FROM workspace_chore
+                    WHERE workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) != ''
+                )
+            );
+
+            DROP POLICY IF EXISTS choreresponsible_insert ON workspace_choreresponsible;
+            CREATE POLICY choreresponsible_insert ON workspace_choreresponsible
+            FOR INSERT
+            WITH CHECK (
+                chore_id IN (
+                    SELECT id
+                    FROM workspace_chore
+                    WHERE workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) IN ('owner', 'manager')
+                )
+            );
+
+            DROP POLICY IF EXISTS choreresponsible_update ON workspace_choreresponsible;
+            CREATE POLICY choreresponsible_update ON workspace_choreresponsible
+            FOR UPDATE
+            USING (
+                chore_id IN (
+                    SELECT id
+                    FROM workspace_chore
+                    WHERE workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) IN ('owner', 'manager')
+                )
+            );
+
+            DROP POLICY IF EXISTS choreresponsible_delete ON workspace_choreresponsible;
+            CREATE POLICY choreresponsible_delete ON workspace_choreresponsible
+            FOR DELETE
+            USING (
+                chore_id IN (
+                    SELECT id
+                    FROM workspace_chore
+                    WHERE workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) IN ('owner', 'manager')
+                )
+            );
+            """
+        ),
+        # ChoreAssigned policies
+        migrations.RunSQL(
+            sql="""
+            DROP POLICY IF EXISTS choreassigned_select ON workspace_choreassigned;
+            CREATE POLICY choreassigned_select ON workspace_choreassigned
+            FOR SELECT
+            USING (
+                chore_id IN (
+                    SELECT id
+                    FROM workspace_chore
+                    WHERE workspace_id = ANY ((SELECT workspace_member_workspaces()))
+                )
+            );
+
+            DROP POLICY IF EXISTS choreassigned_insert ON workspace_choreassigned;
+            CREATE POLICY choreassigned_insert ON workspace_choreassigned
+            FOR INSERT
+            WITH CHECK (
+                chore_id IN (
+                    SELECT id
+                    FROM workspace_chore
+                    WHERE workspace_id = ANY ((SELECT workspace_member_workspaces('{owner,manager}')))
+                )
+                OR user_id = (SELECT workspace_current_user_id())
+            );
+
+            DROP POLICY IF EXISTS choreassigned_update ON workspace_choreassigned;
+            CREATE POLICY choreassigned_update ON workspace_choreassigned
+            FOR UPDATE
+            USING (
+                chore_id IN (
+                    SELECT id
+                    FROM workspace_chore
+                    WHERE workspace_id = ANY ((SELECT workspace_member_workspaces('{owner,manager}')))
+                )
+                OR user_id = (SELECT workspace_current_user_id())
+            );
+
+            DROP POLICY IF EXISTS choreassigned_delete ON workspace_choreassigned;
+            CREATE POLICY choreassigned_delete ON workspace_choreassigned
+            FOR DELETE
+            USING (
+                chore_id IN (
+                    SELECT id
+                    FROM workspace_chore
+                    WHERE workspace_id = ANY ((SELECT workspace_member_workspaces('{owner,manager}')))
+                )
+            );
+            """,
+            reverse_sql="""
+            DROP POLICY IF EXISTS choreassigned_select ON workspace_choreassigned;
+            CREATE POLICY choreassigned_select ON workspace_choreassigned
+            FOR SELECT
+            USING (
+                chore_id IN (
+                    SELECT id
+                    FROM workspace_chore
+                    WHERE workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) != ''
+                )
+            );
+
+            DROP POLICY IF EXISTS choreassigned_insert ON workspace_choreassigned;
+            CREATE POLICY choreassigned_insert ON workspace_choreassigned
+            FOR INSERT
+            WITH CHECK (
+                chore_id IN (
+                    SELECT id
+                    FROM workspace_chore
+                    WHERE workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) IN ('owner', 'manager')
+                )
+                OR user_id = current_setting('workspace.current_user_id')::integer
+            );
+
+            DROP POLICY IF EXISTS choreassigned_update ON workspace_choreassigned;
+            CREATE POLICY choreassigned_update ON workspace_choreassigned
+            FOR UPDATE
+            USING (
+                chore_id IN (
+                    SELECT id
+                    FROM workspace_chore
+                    WHERE workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) IN ('owner', 'manager')
+                )
+                OR user_id = current_setting('workspace.current_user_id')::integer
+            );
+
+            DROP POLICY IF EXISTS choreassigned_delete ON workspace_choreassigned;
+            CREATE POLICY choreassigned_delete ON workspace_choreassigned
+            FOR DELETE
+            USING (
+                chore_id IN (
+                    SELECT id
+                    FROM workspace_chore
+                    WHERE workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) IN ('owner', 'manager')
+                )
+            );
+            """
+        ),
+        # ChoreAssignmentSubmission policies
+        migrations.RunSQL(
+            sql="""
+            DROP POLICY IF EXISTS choreassignmentsubmission_select ON workspace_choreassignmentsubmission;
+            CREATE POLICY choreassignmentsubmission_select ON workspace_choreassignmentsubmission
+            FOR SELECT
+            USING (
+                chore_assigned_id IN (
+                    SELECT id
+                    FROM workspace_choreassigned
+                    WHERE chore_id IN (
+                        SELECT id
+                        FROM workspace_chore
+                        WHERE workspace_id = ANY ((SELECT workspace_member_workspaces()))
+                    )
+                )
+            );
+
+            DROP POLICY IF EXISTS choreassignmentsubmission_insert ON workspace_choreassignmentsubmission;
+            CREATE POLICY choreassignmentsubmission_insert ON workspace_choreassignmentsubmission
+            FOR INSERT
+            WITH CHECK (
+                chore_assigned_id IN (
+                    SELECT id
+                    FROM workspace_choreassigned
+                    WHERE chore_id IN (
+                        SELECT id
+                        FROM workspace_chore
+                        WHERE workspace_id = ANY ((SELECT workspace_member_workspaces('{owner,manager}')))
+                    )
+                    OR user_id = (SELECT workspace_current_user_id())
+                )
+            );
+
+            DROP POLICY IF EXISTS choreassignmentsubmission_update ON workspace_choreassignmentsubmission;
+            CREATE POLICY choreassignmentsubmission_update ON workspace_choreassignmentsubmission
+            FOR UPDATE
+            USING (
+                user_id = (SELECT workspace_current_user_id())
+            );
+
+            DROP POLICY IF EXISTS choreassignmentsubmission_delete ON workspace_choreassignmentsubmission;
+            CREATE POLICY choreassignmentsubmission_delete ON workspace_choreassignmentsubmission
+            FOR DELETE
+            USING (
+                user_id = (SELECT workspace_current_user_id())
+                OR (SELECT workspace_id FROM workspace_chore WHERE id = (SELECT chore_id FROM workspace_choreassigned WHERE id = chore_assigned_id)) = ANY ((SELECT workspace_member_workspaces('{owner,manager}')))
+            );
+            """,
+            reverse_sql="""
+            DROP POLICY IF EXISTS choreassignmentsubmission_select ON workspace_choreassignmentsubmission;
+            CREATE POLICY choreassignmentsubmission_select ON workspace_choreassignmentsubmission
+            FOR SELECT
+            USING (
+                chore_assigned_id IN (
+                    SELECT id
+                    FROM workspace_choreassigned
+                    WHERE chore_id IN (
+                        SELECT id
+                        FROM workspace_chore
+                        WHERE workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) != ''
+                    )
+                )
+            );
+
+            DROP POLICY IF EXISTS choreassignmentsubmission_insert ON workspace_choreassignmentsubmission;
+            CREATE POLICY choreassignmentsubmission_insert ON workspace_choreassignmentsubmission
+            FOR INSERT
+            WITH CHECK (
+                chore_assigned_id IN (
+                    SELECT id
+                    FROM workspace_choreassigned
+                    WHERE chore_id IN (
+                        SELECT id
+                        FROM workspace_chore
+                        WHERE workspace_check_workspace_role(workspace_id, current_setting('workspace.current_user_id')::integer) IN ('owner', 'manager')
+                    )
+                    OR user_id = current_setting('workspace.current_user_id')::integer
+                )
+            );
+
+            DROP POLICY IF EXISTS choreassignmentsubmission_update ON workspace_choreassignmentsubmission;
+            CREATE POLICY choreassignmentsubmission_update ON workspace_choreassignmentsubmission
+            FOR UPDATE
+            USING (
+                user_id = current_setting('workspace.current_user_id')::integer
+            );
+
+            DROP POLICY IF EXISTS choreassignmentsubmission_delete ON workspace_choreassignmentsubmission;
+            CREATE POLICY choreassignmentsubmission_delete ON workspace_choreassignmentsubmission
+            FOR DELETE
+            USING (
+                user_id = current_setting('workspace.current_user_id')::integer
+                OR workspace_check_workspace_role(
+                    (SELECT workspace_id
+                     FROM workspace_chore
+                     WHERE id = (SELECT chore_id FROM workspace_choreassigned WHERE id = chore_assigned_id)),
+                    current_setting('workspace.current_user_id')::integer
+                ) IN ('owner', 'manager')
+            );
+            """
+        ),
+    ]
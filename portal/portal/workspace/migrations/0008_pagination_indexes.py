@@ -0,0 +1,33 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspace', '0007_policy'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chore',
+            index=models.Index(fields=['workspace', '-updated_at', '-id'], name='workspace_c_workspa_d6b8ec_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='choreassigned',
+            index=models.Index(fields=['workspace', '-updated_at', '-id'], name='workspace_c_workspa_a51496_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['workspace', '-updated_at', '-id'], name='workspace_t_workspa_415f32_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskcomment',
+            index=models.Index(fields=['task', '-updated_at', '-id'], name='workspace_t_task_id_93dc39_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskcommentfile',
+            index=models.Index(fields=['-created_at', '-id'], name='workspace_t_created_03c14c_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:50
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspace', '0008_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('task', 'Task'), ('comment', 'Comment'), ('chore', 'Chore'), ('assignment', 'Assignment')], max_length=20)),
+                ('object_id', models.UUIDField()),
+                ('parent_id', models.UUIDField(blank=True, null=True)),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+                ('workspace', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tombstones', to='workspace.workspace')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['workspace', 'deleted_at'], name='workspace_t_workspa_ed0b11_idx'), models.Index(fields=['deleted_at'], name='workspace_t_deleted_5e60cb_idx')],
+            },
+        ),
+    ]
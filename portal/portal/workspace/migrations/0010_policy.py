@@ -0,0 +1,42 @@
+from django.db import migrations
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspace', '0009_tombstone'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+            ALTER TABLE workspace_tombstone ENABLE ROW LEVEL SECURITY;
+            """,
+            reverse_sql="""
+            ALTER TABLE workspace_tombstone DISABLE ROW LEVEL SECURITY;
+            """
+        ),
+        # Tombstone policies: written by the delete signals of whoever may
+        # delete in the workspace, read by its members. Only the scheduler
+        # purges them, outside of the portal role.
+        migrations.RunSQL(
+            sql="""
+            DROP POLICY IF EXISTS tombstone_select ON workspace_tombstone;
+            CREATE POLICY tombstone_select ON workspace_tombstone
+            FOR SELECT
+            USING (
+                workspace_id = ANY ((SELECT workspace_member_workspaces()))
+            );
+
+            DROP POLICY IF EXISTS tombstone_insert ON workspace_tombstone;
+            CREATE POLICY tombstone_insert ON workspace_tombstone
+            FOR INSERT
+            WITH CHECK (
+                workspace_id = ANY ((SELECT workspace_member_workspaces()))
+            );
+            """,
+            reverse_sql="""
+            DROP POLICY IF EXISTS tombstone_select ON workspace_tombstone;
+            DROP POLICY IF EXISTS tombstone_insert ON workspace_tombstone;
+            """
+        ),
+    ]
@@ -3,4 +3,5 @@ from .chore import Chore, ChoreAssigned, ChoreAssignmentSubmission, ChoreRespons
 from .organization import Organization, OrganizationMember
 from .stage import Stage
 from .task import Task, TaskComment, TaskCommentFile
+from .tombstone import Tombstone
 from .workspace import Workspace, WorkspaceMember, WorkspaceInvite
@@ -26,6 +26,7 @@ class Chore(models.Model):
         indexes = [
             models.Index(fields=['workspace']),
             models.Index(fields=['recurrence']),
+            models.Index(fields=['workspace', '-updated_at', '-id']),
         ]
 
     def __str__(self):
@@ -71,16 +72,20 @@ class ChoreAssigned(models.Model):
             models.Index(fields=['assigned_at']),
             models.Index(fields=['chore', 'user', 'closed']),
             models.Index(fields=['workspace',]),
+            models.Index(fields=['workspace', '-updated_at', '-id']),
         ]
         unique_together = ['chore', 'user', 'assigned_at']
 
     def save(self, *args, **kwargs):
+        self.update_closed()
+        super().save(*args, **kwargs)
+
+    def update_closed(self):
         # Auto-set closed=True if status is done or cancelled
         if self.status in [StatusChoices.DONE, StatusChoices.CANCELLED]:
             self.closed = True
         else:
             self.closed = False
-        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.user.username} assigned {self.chore.title} - {self.status}"
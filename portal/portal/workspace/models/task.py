@@ -22,6 +22,7 @@ class Task(models.Model):
         indexes = [
             models.Index(fields=['workspace', 'stage_key']),
             models.Index(fields=['owner']),
+            models.Index(fields=['workspace', '-updated_at', '-id']),
         ]
 
     def __str__(self):
@@ -38,6 +39,7 @@ class TaskComment(models.Model):
     class Meta:
         indexes = [
             models.Index(fields=['task', 'created_at']),
+            models.Index(fields=['task', '-updated_at', '-id']),
         ]
 
     def __str__(self):
@@ -64,6 +66,7 @@ class TaskCommentFile(models.Model):
             models.Index(fields=['comment']),
             models.Index(fields=['file']),
             models.Index(fields=['task']),
+            models.Index(fields=['-created_at', '-id']),
         ]
 
     def __str__(self):
@@ -0,0 +1,32 @@
+import uuid
+from django.db import models
+
+from portal.workspace.models.workspace import Workspace
+
+class Tombstone(models.Model):
+    """
+    Record of a deleted task, comment, chore or assignment, so the changes
+    endpoint can report deletions since a version. Rows older than
+    ``PORTAL_API['TOMBSTONE_RETENTION']`` are purged by the scheduler.
+    """
+    class KindChoices(models.TextChoices):
+        TASK = 'task', 'Task'
+        COMMENT = 'comment', 'Comment'
+        CHORE = 'chore', 'Chore'
+        ASSIGNMENT = 'assignment', 'Assignment'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    workspace = models.ForeignKey(Workspace, on_delete=models.CASCADE, related_name='tombstones')
+    kind = models.CharField(max_length=20, choices=KindChoices.choices)
+    object_id = models.UUIDField()
+    parent_id = models.UUIDField(null=True, blank=True)  # Task of a deleted comment
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['workspace', 'deleted_at']),
+            models.Index(fields=['deleted_at']),
+        ]
+
+    def __str__(self):
+        return f"Deleted {self.kind} {self.object_id}"
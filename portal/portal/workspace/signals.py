@@ -1,9 +1,14 @@
 from django.db import connection
-from django.db.models.signals import post_save
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
+from django.utils import timezone
 
 from portal.workspace.middleware import get_current_user
-from portal.workspace.models import Organization, Workspace, OrganizationMember, WorkspaceMember
+from portal.workspace.models import (
+    Organization, Workspace, OrganizationMember, WorkspaceMember,
+    Task, TaskComment, Chore, ChoreAssigned, ChoreResponsible, Tombstone,
+)
 
 @receiver(post_save, sender=Organization)
 def create_organization_member(sender, instance, created, **kwargs):
@@ -30,3 +35,54 @@ def create_workspace_member(sender, instance, created, **kwargs):
                 user=user,
                 role='owner'
             )
+
+def _deleted_with(origin, *models):
+    """Whether the delete cascades from an instance or queryset of `models`."""
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(model, models)
+
+@receiver(post_delete, sender=Task)
+def record_task_deletion(sender, instance, origin=None, **kwargs):
+    # Whole workspaces go with their tombstones, nothing to record
+    if _deleted_with(origin, Organization, Workspace):
+        return
+    Tombstone.objects.create(
+        workspace_id=instance.workspace_id, kind=Tombstone.KindChoices.TASK, object_id=instance.id,
+    )
+
+@receiver(post_delete, sender=TaskComment)
+def record_task_comment_deletion(sender, instance, origin=None, **kwargs):
+    # The task tombstone already covers its comments
+    if _deleted_with(origin, Organization, Workspace, Task):
+        return
+    workspace_id = Task.objects.filter(id=instance.task_id).values_list('workspace_id', flat=True).first()
+    if workspace_id:
+        Tombstone.objects.create(
+            workspace_id=workspace_id, kind=Tombstone.KindChoices.COMMENT,
+            object_id=instance.id, parent_id=instance.task_id,
+        )
+
+@receiver(post_delete, sender=Chore)
+def record_chore_deletion(sender, instance, origin=None, **kwargs):
+    if _deleted_with(origin, Organization, Workspace):
+        return
+    Tombstone.objects.create(
+        workspace_id=instance.workspace_id, kind=Tombstone.KindChoices.CHORE, object_id=instance.id,
+    )
+
+@receiver(post_delete, sender=ChoreAssigned)
+def record_chore_assignment_deletion(sender, instance, origin=None, **kwargs):
+    if _deleted_with(origin, Organization, Workspace) or not instance.workspace_id:
+        return
+    Tombstone.objects.create(
+        workspace_id=instance.workspace_id, kind=Tombstone.KindChoices.ASSIGNMENT, object_id=instance.id,
+    )
+
+@receiver(post_save, sender=ChoreResponsible)
+@receiver(post_delete, sender=ChoreResponsible)
+def touch_chore_for_responsible(sender, instance, origin=None, **kwargs):
+    # Chores embed their responsibles: move the chore forward so delta sync
+    # re-sends it
+    if origin is not None and _deleted_with(origin, Organization, Workspace, Chore):
+        return
+    Chore.objects.filter(id=instance.chore_id).update(updated_at=timezone.now())
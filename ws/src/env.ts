@@ -4,6 +4,8 @@ export const env = {
   REDIS_PORT: parseInt(process.env.REDIS_PORT || "6379", 10),
   REDIS_DB: parseInt(process.env.REDIS_DB || "0", 10),
   PORT: parseInt(process.env.PORT || "8080", 10),
+  // Must match PORTAL_CACHE['SUBSCRIPTION_TTL'] on the portal
+  SUBSCRIPTION_TTL: parseInt(process.env.SUBSCRIPTION_TTL || "604800", 10),
   VAPID_PUBLIC_KEY: process.env.VAPID_PUBLIC_KEY || null,
   VAPID_PRIVATE_KEY: process.env.VAPID_PRIVATE_KEY || null,
 };
@@ -18,30 +18,40 @@ export async function setupRedis(
   const subscriber = client.duplicate();
   await subscriber.connect();
   await subscriber.subscribe("resource-updates", async (message) => {
+    // The portal already stored the version atomically before publishing it
     const update: ResourceUpdate = JSON.parse(message);
-    // Store timestamp for the resource
-    await client.set(`resource-timestamps:${update.key}`, update.timestamp);
     await onUpdate(update);
   });
 
   return client;
 }
 
+// Subscriptions are sorted sets scored by last access (ms), trimmed by the portal
+function subscriptionCutoff(): number {
+  return Date.now() - env.SUBSCRIPTION_TTL * 1000;
+}
+
 export async function getResourceUsers(client: any, key: string): Promise<string[]> {
-  const users = await client.sMembers(`resource-users:${key}`);
+  const users = await client.zRangeByScore(`resource-subscribers:${key}`, subscriptionCutoff(), "+inf");
   return users || [];
 }
 
 export async function getUserResources(client: any, userId: string, timestamp: number): Promise<ResourceUpdate[]> {
   const items: ResourceUpdate[] = [];
 
-  const resources = await client.sMembers(`user-resources:${userId}`);
-  for (const resource of resources) {
-    const resourceTimestamp = await client.get(`resource-timestamps:${resource}`);
+  const resources: string[] = await client.zRangeByScore(`user-subscriptions:${userId}`, subscriptionCutoff(), "+inf");
+  if (!resources || resources.length === 0) {
+    return items;
+  }
+
+  // Hydrate every subscription in a single round-trip
+  const timestamps = await client.mGet(resources.map((resource) => `resource-timestamps:${resource}`));
+  resources.forEach((resource, index) => {
+    const resourceTimestamp = timestamps[index];
     if (resourceTimestamp && parseInt(resourceTimestamp) > timestamp) {
       items.push({ key: resource, timestamp: parseInt(resourceTimestamp) });
     }
-  }
+  });
 
   return items;
 }
@@ -1,5 +1,6 @@
 export interface ResourceUpdate {
   key: string;
+  // Monotonic resource version, in milliseconds since the epoch
   timestamp: number;
 }
 